@@ -1,19 +1,46 @@
 """Research orchestrator that coordinates the complete workflow."""
 
+import asyncio
+import io
+import os
+import re
+import socket
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
-from typing import Dict
+from typing import Callable, Dict, Optional
+
+import requests
 
 from src.analysis.fact_extractor import FactExtractor
 from src.analysis.query_decomposer import QueryDecomposer
 from src.analysis.synthesizer import Synthesizer
 from src.search.content_fetcher import ContentFetcher
 from src.search.search_engine import SearchEngine
-from src.search.search_types import ResearchReport, Source
+from src.search.search_types import ResearchReport, SearchResult, Source
+from src.utils.claude_client import get_claude_client
 from src.utils.logging_setup import get_logger
+from src.utils.rate_limiter import ResizableSemaphore
+from src.utils.url_utils import normalize_url
 
 logger = get_logger(__name__)
 
+# Host resolved during warmup so the first Claude call skips a cold DNS lookup
+ANTHROPIC_API_HOST = 'api.anthropic.com'
+
+# Single-fact questions that are already searchable as asked
+SINGLE_FACT_RE = re.compile(r'\b(what is|who is|when did)\b', re.IGNORECASE)
+
+# Adaptive fetch concurrency: bounds on the permit count, and how many
+# completed fetches pass between adjustments
+MIN_FETCH_PERMITS = 4
+MAX_FETCH_PERMITS = 64
+FETCH_ADJUST_EVERY = 8
+
 
 class ResearchOrchestrator:
     """
@@ -31,20 +58,119 @@ class ResearchOrchestrator:
         """
         self.config = config
 
+        # One HTTP session for all page fetches, so keep-alive connections
+        # (and their TCP/TLS handshakes) are reused across sources
+        self._http = requests.Session()
+
+        # One Claude client shared by all components (and all orchestrators in
+        # the process), so they share the response cache and the RPM/TPM
+        # limiter, plus one connection pool per run
+        self._claude = get_claude_client(config)
+
         # Initialize all components
         logger.info("Initializing research components...")
-        self.decomposer = QueryDecomposer(config)
+        self.decomposer = QueryDecomposer(config, client=self._claude)
         self.search_engine = SearchEngine(config)
-        self.fetcher = ContentFetcher(config)
-        self.extractor = FactExtractor(config)
-        self.synthesizer = Synthesizer(config)
+        self.fetcher = ContentFetcher(config, http_client=self._http)
+        self.extractor = FactExtractor(config, client=self._claude)
+        self.synthesizer = Synthesizer(config, client=self._claude)
 
         # Output settings
         self.report_dir = Path(config['output']['report_dir'])
         self.report_dir.mkdir(parents=True, exist_ok=True)
         self.save_intermediate = config['output'].get('save_intermediate', False)
 
-    def research(self, question: str) -> ResearchReport:
+        # Report files are written in the background so research() returns sooner
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='report-io')
+        self._pending_writes: list[Future] = []
+
+        # Progress of the current run, for UIs polling from another thread
+        self.current_step = ''
+        self.progress_pct = 0
+
+        # Concurrency settings
+        self.max_concurrent_fetches = config['agent'].get('max_concurrent_fetches', 8)
+
+        # Fetch concurrency adapts to observed latency, starting from
+        # max_concurrent_fetches; more permits than fetch threads would only queue
+        self.target_p95_ms = config['agent'].get('target_p95_ms', 2000)
+        self._max_fetch_permits = min(
+            MAX_FETCH_PERMITS, config['agent'].get('fetch_workers', 16)
+        )
+        self._lat_hist: deque = deque(maxlen=64)
+        self._fetch_count = 0
+        self._fetch_permits = self.max_concurrent_fetches
+
+        # Shorter questions skip the Claude decomposition round-trip
+        self.decompose_min_words = config['agent'].get('decompose_min_words', 6)
+
+        # Pay one-time startup costs in the background while the user types
+        self._warmup_thread = None
+        if config['agent'].get('warmup', True):
+            self._warmup_thread = threading.Thread(
+                target=self._warmup, name='research-warmup', daemon=True
+            )
+            self._warmup_thread.start()
+
+    def __enter__(self) -> 'ResearchOrchestrator':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Finish pending report writes and release worker threads."""
+        self.flush_writes()
+        self._io_pool.shutdown(wait=True)
+        self.search_engine.close()
+        self.fetcher.close()
+        self._http.close()
+
+    def flush_writes(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for background report/source writes to finish.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+        """
+        if self._pending_writes:
+            wait(self._pending_writes, timeout=timeout)
+        self._pending_writes = [f for f in self._pending_writes if not f.done()]
+
+    def research(
+        self,
+        question: str,
+        on_answer: Optional[Callable[[str], None]] = None
+    ) -> ResearchReport:
+        """
+        Conduct complete research for a question.
+
+        Synchronous entry point that runs research_async() on a fresh event
+        loop, closing the loop's Claude connections before it ends.
+
+        Args:
+            question: The research question
+            on_answer: Optional callback receiving the answer text as it streams in
+
+        Returns:
+            Complete ResearchReport object
+
+        Raises:
+            ValueError: If no sources are found
+        """
+        async def run() -> ResearchReport:
+            try:
+                return await self.research_async(question, on_answer=on_answer)
+            finally:
+                await self._claude.aclose_loop_client()
+
+        return asyncio.run(run())
+
+    async def research_async(
+        self,
+        question: str,
+        on_answer: Optional[Callable[[str], None]] = None
+    ) -> ResearchReport:
         """
         Conduct complete research for a question.
 
@@ -56,8 +182,11 @@ class ResearchOrchestrator:
         5. Synthesize findings (AGENT DECISION POINT)
         6. Generate report
 
+        Steps 2-4 overlap: extraction starts on each source as soon as it is fetched.
+
         Args:
             question: The research question
+            on_answer: Optional callback receiving the answer text as it streams in
 
         Returns:
             Complete ResearchReport object
@@ -66,22 +195,69 @@ class ResearchOrchestrator:
             ValueError: If no sources are found
         """
         logger.info(f"Starting research for: '{question}'")
+        self._set_progress("Breaking down your question...", 5)
+
+        # One clock read per run, shared by every source, the saved files and the report
+        self._run_ts = datetime.now()
+
+        # Let warmup finish (briefly) so the first calls find everything ready
+        if self._warmup_thread is not None and self._warmup_thread.is_alive():
+            self._warmup_thread.join(timeout=2)
 
         # Step 1: Decompose question into sub-queries
         # AGENT DECISION POINT: How to break down the question for optimal coverage
         logger.info("Step 1: Decomposing question into sub-queries...")
-        try:
-            sub_queries = self.decomposer.decompose(question)
-            logger.info(f"Generated {len(sub_queries)} sub-queries: {sub_queries}")
-        except Exception as e:
-            logger.error(f"Decomposition failed: {e}")
-            # Fallback to original question
-            sub_queries = [question]
 
-        # Step 2 & 3: Search and fetch content for each sub-query
+        # Start searching each sub-query as soon as it streams in
+        pending_searches: Dict[str, asyncio.Task] = {}
+
+        def dispatch_search(query: str) -> None:
+            if query not in pending_searches:
+                pending_searches[query] = asyncio.create_task(
+                    self.search_engine.search_async(query)
+                )
+
+        if not self._needs_decomposition(question):
+            logger.info("Skipping decomposition (fast path)")
+            sub_queries = [question]
+        else:
+            try:
+                sub_queries = await self.decomposer.decompose(question, on_query=dispatch_search)
+                logger.info(f"Generated {len(sub_queries)} sub-queries: {sub_queries}")
+            except Exception as e:
+                logger.error(f"Decomposition failed: {e}")
+                # Fallback to original question
+                sub_queries = [question]
+
+        # Steps 2-4 run as a pipeline: each fetched source is queued for fact
+        # extraction right away, so Claude works while later pages download
         # AGENT DECISION POINT: Search strategy per query
-        logger.info("Step 2-3: Searching and fetching content...")
-        all_sources = self._search_and_fetch(sub_queries)
+        # AGENT DECISION POINT: What facts are relevant and reliable
+        logger.info("Step 2-4: Searching, fetching content and extracting facts...")
+        self._set_progress("Searching, reading and extracting facts from sources...", 20)
+        source_queue: asyncio.Queue = asyncio.Queue()
+        fetched = 0
+
+        def on_source(source: Source) -> None:
+            nonlocal fetched
+            fetched += 1
+            self._set_progress(
+                f"Read {fetched} sources, extracting facts...", min(75, 20 + 5 * fetched)
+            )
+            source_queue.put_nowait(source)
+
+        async def produce_sources() -> list[Source]:
+            try:
+                return await self._search_and_fetch_async(
+                    sub_queries, pending_searches, on_source=on_source
+                )
+            finally:
+                source_queue.put_nowait(None)  # No more sources
+
+        all_sources, facts = await asyncio.gather(
+            produce_sources(),
+            self.extractor.extract_from_queue(source_queue, question)
+        )
 
         if not all_sources:
             raise ValueError(
@@ -93,12 +269,11 @@ class ResearchOrchestrator:
 
         # Save intermediate results if configured
         if self.save_intermediate:
-            self._save_sources(question, all_sources)
+            self._schedule_write(self._save_sources, question, all_sources, self._run_ts)
 
-        # Step 4: Extract facts from all sources
-        # AGENT DECISION POINT: What facts are relevant and reliable
-        logger.info("Step 4: Extracting key facts from sources...")
-        facts = self.extractor.extract_facts(all_sources, question)
+        # Facts arrive in fetch-completion order; list them in source order
+        source_order = {source.url: idx for idx, source in enumerate(all_sources)}
+        facts.sort(key=lambda fact: source_order.get(fact.source_url, len(source_order)))
         logger.info(f"Extracted {len(facts)} facts")
 
         if not facts:
@@ -107,67 +282,210 @@ class ResearchOrchestrator:
         # Step 5: Synthesize findings
         # AGENT DECISION POINT: How to reconcile conflicts and identify gaps
         logger.info("Step 5: Synthesizing findings...")
-        synthesis = self.synthesizer.synthesize(question, facts)
+        self._set_progress("Synthesizing findings...", 80)
+        synthesis = await self.synthesizer.synthesize(question, facts, on_answer=on_answer)
 
         # Step 6: Create report
         logger.info("Step 6: Generating report...")
+        self._set_progress("Generating report...", 95)
         report = ResearchReport(
             question=question,
             sub_queries=sub_queries,
             sources=all_sources,
             facts=facts,
             synthesis=synthesis,
-            timestamp=datetime.now()
+            timestamp=self._run_ts
         )
 
-        # Save report
-        self._save_report(report)
+        # Save report in the background
+        self._schedule_write(self._save_report, report)
 
         logger.info("Research completed successfully!")
+        self._set_progress("Research complete!", 100)
         return report
 
-    def _search_and_fetch(self, queries: list[str]) -> list[Source]:
+    def _set_progress(self, step: str, pct: int) -> None:
+        """Record the current step and overall progress (0-100)."""
+        self.current_step = step
+        self.progress_pct = pct
+
+    def _needs_decomposition(self, question: str) -> bool:
         """
-        Search for and fetch content for multiple queries.
+        Decide whether a question is worth a Claude decomposition call.
+
+        Args:
+            question: The research question
+
+        Returns:
+            False for short or single-fact questions, which are searched as asked
+        """
+        if len(question.split()) < self.decompose_min_words:
+            return False
+        return SINGLE_FACT_RE.search(question) is None
+
+    async def _search_and_fetch_async(
+        self,
+        queries: list[str],
+        pending_searches: Optional[Dict[str, asyncio.Task]] = None,
+        on_source: Optional[Callable[[Source], None]] = None
+    ) -> list[Source]:
+        """
+        Search for and fetch content for multiple queries concurrently.
+
+        All sub-query searches are launched at once, then every result URL is
+        fetched concurrently. The number of fetches in flight starts at
+        agent.max_concurrent_fetches and adapts to observed fetch latency.
 
         Args:
             queries: List of search queries
+            pending_searches: Searches already started during decomposition, by query
+            on_source: Optional callback invoked with each Source as soon as it is fetched
 
         Returns:
-            List of Source objects with content
+            List of Source objects with content, in query/result order
 
         Note:
             Continues with partial results if some searches/fetches fail.
+            A page returned by several sub-queries is fetched only once.
         """
-        all_sources = []
+        semaphore = ResizableSemaphore(self._fetch_permits)
+
+        async def bounded_fetch(result: SearchResult) -> Optional[Source]:
+            async with semaphore:
+                start = time.monotonic()
+                content = await self.fetcher.fetch_content_async(result.url)
+                await self._record_fetch_latency(time.monotonic() - start, semaphore)
+
+            if not content:
+                logger.warning(f"Failed to fetch content from: {result.url}")
+                return None
+
+            source = Source(
+                url=result.url,
+                title=result.title,
+                content=content,
+                fetch_time=self._run_ts
+            )
+            if on_source is not None:
+                on_source(source)
+            return source
+
+        # Search all sub-queries at once, reusing searches already in flight
+        logger.info(f"Searching {len(queries)} queries concurrently")
+        pending_searches = dict(pending_searches or {})
+        search_tasks = [
+            pending_searches.pop(query, None) or self.search_engine.search_async(query)
+            for query in queries
+        ]
+
+        # Drop early searches for sub-queries that didn't make the final list
+        for task in pending_searches.values():
+            task.cancel()
+
+        search_outcomes = await asyncio.gather(*search_tasks, return_exceptions=True)
+
+        all_results = []
+        seen_urls = set()
+        for query, outcome in zip(queries, search_outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Search failed for '{query}': {outcome}")
+                continue
+
+            if not outcome:
+                logger.warning(f"No search results for: '{query}'")
+                continue
 
-        for query in queries:
-            logger.info(f"Searching for: '{query}'")
+            # Skip pages already found by an earlier sub-query
+            for result in outcome:
+                url_key = normalize_url(result.url)
+                if url_key in seen_urls:
+                    logger.info(f"Skipping duplicate result: {result.url}")
+                    continue
+                seen_urls.add(url_key)
+                all_results.append(result)
 
-            # Search
-            search_results = self.search_engine.search(query)
+        # Fetch content from every result, preserving result order
+        fetch_tasks = [bounded_fetch(result) for result in all_results]
+        outcomes = await asyncio.gather(*fetch_tasks, return_exceptions=True)
 
-            if not search_results:
-                logger.warning(f"No search results for: '{query}'")
+        all_sources = []
+        for result, outcome in zip(all_results, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Unexpected error fetching {result.url}: {outcome}")
                 continue
 
-            # Fetch content from each result
-            for result in search_results:
-                content = self.fetcher.fetch_content(result.url)
-
-                if content:
-                    source = Source(
-                        url=result.url,
-                        title=result.title,
-                        content=content,
-                        fetch_time=datetime.now()
-                    )
-                    all_sources.append(source)
-                else:
-                    logger.warning(f"Failed to fetch content from: {result.url}")
+            if outcome is not None:
+                all_sources.append(outcome)
 
         return all_sources
 
+    async def _record_fetch_latency(
+        self,
+        elapsed: float,
+        semaphore: ResizableSemaphore
+    ) -> None:
+        """
+        Record a fetch duration and periodically resize the fetch semaphore.
+
+        Every FETCH_ADJUST_EVERY fetches, permits are scaled by
+        target_p95_ms / median latency: fast upstreams get more parallel
+        fetches, slow ones fewer.
+
+        Args:
+            elapsed: Fetch duration in seconds
+            semaphore: The semaphore bounding the current run's fetches
+        """
+        self._lat_hist.append(elapsed * 1000)
+        self._fetch_count += 1
+        if self._fetch_count % FETCH_ADJUST_EVERY:
+            return
+
+        median_ms = max(statistics.median(self._lat_hist), 1.0)
+        target = int(self.target_p95_ms / median_ms * semaphore.permits)
+        target = max(MIN_FETCH_PERMITS, min(self._max_fetch_permits, target))
+
+        if target != semaphore.permits:
+            await semaphore.resize(target)
+            self._fetch_permits = target
+            logger.info(f"Fetch concurrency adjusted to {target} (median latency {median_ms:.0f}ms)")
+
+    def _warmup(self) -> None:
+        """
+        Warm up network and parsing paths before the first research run.
+
+        Resolves the Anthropic API host (priming the system resolver cache)
+        and runs the HTML extractor once so its lazy imports are loaded.
+        """
+        try:
+            socket.getaddrinfo(ANTHROPIC_API_HOST, 443, type=socket.SOCK_STREAM)
+        except OSError as e:
+            logger.debug(f"Warmup DNS lookup failed: {e}")
+
+        self.fetcher.warmup()
+        logger.debug("Warmup complete")
+
+    def _schedule_write(self, write_fn: Callable, *args) -> None:
+        """
+        Run a file-writing helper on the I/O thread pool.
+
+        Args:
+            write_fn: Helper such as _save_report or _save_sources
+            *args: Arguments for write_fn
+
+        Note:
+            Failures are logged rather than raised, since research() has
+            already returned by the time they happen. Call flush_writes() or
+            close() to make sure files are on disk.
+        """
+        def log_failure(future: Future) -> None:
+            if future.exception() is not None:
+                logger.error(f"Failed to write research output: {future.exception()}")
+
+        self._pending_writes = [f for f in self._pending_writes if not f.done()]
+        future = self._io_pool.submit(write_fn, *args)
+        future.add_done_callback(log_failure)
+        self._pending_writes.append(future)
+
     def _save_report(self, report: ResearchReport) -> Path:
         """
         Save report to markdown file.
@@ -186,35 +504,50 @@ class ResearchOrchestrator:
         # Generate markdown
         markdown = report.to_markdown()
 
-        # Save to file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(markdown)
+        # Save to file (encoded once, written without the text-mode layer)
+        with open(filepath, 'wb') as f:
+            f.write(markdown.encode('utf-8'))
 
         logger.info(f"Report saved to: {filepath}")
         return filepath
 
-    def _save_sources(self, question: str, sources: list[Source]) -> None:
+    def _save_sources(
+        self,
+        question: str,
+        sources: list[Source],
+        collected_at: datetime
+    ) -> None:
         """
         Save intermediate source data (for debugging).
 
         Args:
             question: Research question
             sources: List of sources
+            collected_at: Start time of the research run
         """
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = collected_at.strftime('%Y%m%d_%H%M%S')
         filename = f"sources_{timestamp}.txt"
         filepath = self.report_dir / filename
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(f"Sources for: {question}\n")
-            f.write(f"Collected at: {datetime.now()}\n")
-            f.write("=" * 80 + "\n\n")
-
-            for idx, source in enumerate(sources, 1):
-                f.write(f"Source {idx}: {source.title}\n")
-                f.write(f"URL: {source.url}\n")
-                f.write(f"Content length: {len(source.content)} characters\n")
-                f.write("-" * 80 + "\n")
-                f.write(source.content[:1000] + "...\n\n")
+        # Build the whole file in memory, then write it with as few syscalls as possible
+        buf = io.StringIO()
+        buf.write(f"Sources for: {question}\n")
+        buf.write(f"Collected at: {collected_at}\n")
+        buf.write("=" * 80 + "\n\n")
+
+        for idx, source in enumerate(sources, 1):
+            buf.write(f"Source {idx}: {source.title}\n")
+            buf.write(f"URL: {source.url}\n")
+            buf.write(f"Content length: {len(source.content)} characters\n")
+            buf.write("-" * 80 + "\n")
+            buf.write(source.content[:1000] + "...\n\n")
+
+        data = memoryview(buf.getvalue().encode('utf-8'))
+        fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data):]  # Usually a single write
+        finally:
+            os.close(fd)
 
         logger.info(f"Sources saved to: {filepath}")
@@ -63,6 +63,45 @@ Return ONLY valid JSON in this format:
 If no relevant facts found, return: {{"facts": []}}
 """
 
+# Batched Fact Extraction Prompt
+# AGENT DECISION POINT: Same as EXTRACT_PROMPT, applied to several sources in one call
+BATCH_EXTRACT_PROMPT = """You are extracting key facts from several sources for research purposes.
+
+Research question: {question}
+
+There are {num_sources} sources below, each introduced by a [SOURCE n] marker:
+
+{sources}
+
+Your task is to extract 3-5 key facts or claims from EACH source that are relevant to answering the research question.
+
+For each fact:
+1. State it clearly and concisely
+2. Note any caveats or conditions
+3. Rate confidence (high/medium/low) based on:
+   - Whether the source provides evidence
+   - Whether it's a primary or secondary source
+   - Whether it's opinion vs fact
+
+AGENT REASONING: Focus on factual claims, not opinions. Note contradictions with common knowledge. Prioritize information that directly answers the research question. Only attribute a fact to the source it actually came from.
+
+Return ONLY valid JSON in this format, with one key per source number:
+{{
+  "sources": {{
+    "1": [
+      {{
+        "claim": "Clear, factual statement",
+        "caveat": "Any limitations or conditions (or null)",
+        "confidence": "high"
+      }}
+    ],
+    "2": []
+  }}
+}}
+
+Use an empty array for any source with no relevant facts.
+"""
+
 # Synthesis Prompt
 # AGENT DECISION POINT: How to reconcile conflicting information and identify gaps
 SYNTHESIZE_PROMPT = """You are synthesizing research findings from multiple sources.
@@ -1,17 +1,35 @@
 """Fact extractor using Claude to extract key information from sources."""
 
-import json
-import time
-from typing import Dict, List
+import asyncio
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
-import anthropic
-
-from src.agent.prompts import EXTRACT_PROMPT
+from src.agent.prompts import BATCH_EXTRACT_PROMPT, EXTRACT_PROMPT
+from src.analysis.relevance import select_relevant
 from src.search.search_types import Fact, Source
+from src.utils.claude_client import AsyncClaudeClient
+from src.utils.json_utils import extract_first_json
 from src.utils.logging_setup import get_logger
+from src.utils.prompt_template import SplitPrompt
+from src.utils.tokens import CHARS_PER_TOKEN
 
 logger = get_logger(__name__)
 
+# How long a partly filled extraction batch waits for more sources to arrive
+BATCH_LINGER_SECONDS = 0.5
+
+_EXTRACT_TEMPLATE = SplitPrompt(EXTRACT_PROMPT)
+_BATCH_EXTRACT_TEMPLATE = SplitPrompt(BATCH_EXTRACT_PROMPT)
+
+
+@lru_cache(maxsize=16)
+def _prompts_for(question: str) -> Tuple[SplitPrompt, SplitPrompt]:
+    """Single-source and batch extraction templates with the question filled in."""
+    return (
+        _EXTRACT_TEMPLATE.bind(question=question),
+        _BATCH_EXTRACT_TEMPLATE.bind(question=question),
+    )
+
 
 class FactExtractor:
     """
@@ -20,24 +38,25 @@ class FactExtractor:
     AGENT DECISION POINT: What facts are relevant and reliable for the research question.
     """
 
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, client: Optional[AsyncClaudeClient] = None):
         """
         Initialize fact extractor.
 
         Args:
             config: Configuration dictionary with API settings
+            client: Shared Claude client (a private one is created if None)
         """
         self.config = config
-        self.client = anthropic.Anthropic(api_key=config['anthropic']['api_key'])
-        self.model = config['anthropic']['model']
-        self.max_tokens = config['anthropic'].get('max_tokens', 4000)
-        self.temperature = config['anthropic'].get('temperature', 0.3)
+        self.client = client or AsyncClaudeClient(config)
 
         self.facts_per_source = config['agent'].get('facts_per_source', 5)
+        self.batch_size = config['agent'].get('extract_batch_size', 4)
+        self.batch_max_chars = config['agent'].get('extract_batch_max_chars', 40000)
+        self.token_budget = config['agent'].get('extract_token_budget', 2000)
 
-    def extract_facts(self, sources: List[Source], question: str) -> List[Fact]:
+    async def extract_facts(self, sources: List[Source], question: str) -> List[Fact]:
         """
-        Extract key facts from multiple sources.
+        Extract key facts from multiple sources concurrently.
 
         Args:
             sources: List of Source objects with content
@@ -50,28 +69,176 @@ class FactExtractor:
             Continues with partial results if some extractions fail.
             Skips sources without content.
         """
-        logger.info(f"Extracting facts from {len(sources)} sources")
+        source_queue: asyncio.Queue = asyncio.Queue()
+        for source in sources:
+            source_queue.put_nowait(source)
+        source_queue.put_nowait(None)
 
-        all_facts = []
+        return await self.extract_from_queue(source_queue, question)
 
-        for source in sources:
-            if not source.content:
-                logger.warning(f"Skipping source with no content: {source.url}")
+    async def extract_from_queue(self, source_queue: asyncio.Queue, question: str) -> List[Fact]:
+        """
+        Extract key facts from sources as they arrive on a queue.
+
+        Each batch is sent to Claude as soon as it is complete, so extraction
+        overlaps with whatever is still producing sources (e.g. page fetches).
+
+        Args:
+            source_queue: Queue of Source objects, terminated by None
+            question: The original research question (for relevance)
+
+        Returns:
+            List of Fact objects with source attribution, in batch order
+
+        Note:
+            Continues with partial results if some extractions fail.
+            Skips sources without content.
+            Sources are batched into shared prompts (agent.extract_batch_size),
+            and the shared client caps Claude calls in flight (anthropic.concurrency).
+        """
+        batches = []
+        tasks = []
+        carry = None
+        finished = False
+        while not finished:
+            batch, carry, finished = await self._next_batch(source_queue, carry)
+            if batch:
+                batches.append(batch)
+                tasks.append(asyncio.create_task(self._extract_from_batch(batch, question)))
+
+        num_sources = sum(len(batch) for batch in batches)
+        logger.info(f"Extracting facts from {num_sources} sources in {len(batches)} batches")
+
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+
+        all_facts = []
+        for batch, outcome in zip(batches, outcomes):
+            if isinstance(outcome, Exception):
+                for source in batch:
+                    logger.error(f"Failed to extract facts from {source.url}: {outcome}")
+                # Continue with other batches instead of failing completely
                 continue
 
-            try:
-                facts = self._extract_from_source(source, question)
+            for source, facts in zip(batch, outcome):
                 all_facts.extend(facts)
                 logger.info(f"Extracted {len(facts)} facts from {source.url}")
 
-            except Exception as e:
-                logger.error(f"Failed to extract facts from {source.url}: {e}")
-                # Continue with other sources instead of failing completely
-
         logger.info(f"Extracted total of {len(all_facts)} facts from all sources")
         return all_facts
 
-    def _extract_from_source(self, source: Source, question: str) -> List[Fact]:
+    async def _next_batch(
+        self, source_queue: asyncio.Queue, carry: Optional[Source]
+    ) -> Tuple[List[Source], Optional[Source], bool]:
+        """
+        Collect the next batch of sources from the queue.
+
+        Waits for a first source, then keeps adding sources (waiting at most
+        BATCH_LINGER_SECONDS for more to arrive) until the batch reaches
+        batch_size sources or its content would exceed batch_max_chars.
+
+        Args:
+            source_queue: Queue of Source objects, terminated by None
+            carry: Source left over from the previous batch, if any
+
+        Returns:
+            Tuple of (batch, carry, finished): the batch, a source that didn't
+            fit and starts the next batch, and whether the queue is exhausted
+        """
+        loop = asyncio.get_running_loop()
+        batch = []
+        batch_chars = 0
+        deadline = None
+
+        while len(batch) < self.batch_size:
+            if carry is not None:
+                source, carry = carry, None
+            elif not batch:
+                source = await source_queue.get()
+            else:
+                remaining = deadline - loop.time()
+                try:
+                    if remaining <= 0:
+                        source = source_queue.get_nowait()
+                    else:
+                        source = await asyncio.wait_for(source_queue.get(), remaining)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+
+            if source is None:
+                return batch, None, True
+
+            if not source.content:
+                logger.warning(f"Skipping source with no content: {source.url}")
+                continue
+
+            length = min(len(source.content), self.token_budget * CHARS_PER_TOKEN)
+            if batch and batch_chars + length > self.batch_max_chars:
+                return batch, source, False
+
+            batch.append(source)
+            batch_chars += length
+            if deadline is None:
+                deadline = loop.time() + BATCH_LINGER_SECONDS
+
+        return batch, None, False
+
+    async def _extract_from_batch(
+        self, batch: List[Source], question: str
+    ) -> List[List[Fact]]:
+        """
+        Extract facts from a batch of sources with a single Claude call.
+
+        Args:
+            batch: Sources to extract from
+            question: Research question
+
+        Returns:
+            One list of Fact objects per source, aligned with batch
+
+        Note:
+            Falls back to one call per source if the batch response can't be parsed.
+        """
+        if len(batch) == 1:
+            return [await self._extract_from_source(batch[0], question)]
+
+        # Format prompt
+        source_blocks = "\n\n".join(
+            f"[SOURCE {idx}] url={source.url}\ncontent:\n{self._excerpt(source, question)}"
+            for idx, source in enumerate(batch, 1)
+        )
+        prompt = _prompts_for(question)[1].render(
+            num_sources=len(batch),
+            sources=source_blocks
+        )
+
+        # Call Claude once for the whole batch; only a parseable reply is cached
+        try:
+            response_text = await self.client.complete(
+                prompt,
+                validate=lambda text: self._parse_batch_facts(text, batch)
+            )
+            return self._parse_batch_facts(response_text, batch)
+
+        except ValueError as e:
+            logger.warning(
+                f"Batch extraction of {len(batch)} sources failed ({e}), "
+                "falling back to per-source extraction"
+            )
+
+        tasks = [self._extract_from_source(source, question) for source in batch]
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = []
+        for source, outcome in zip(batch, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Failed to extract facts from {source.url}: {outcome}")
+                results.append([])
+            else:
+                results.append(outcome)
+
+        return results
+
+    async def _extract_from_source(self, source: Source, question: str) -> List[Fact]:
         """
         Extract facts from a single source.
 
@@ -83,59 +250,34 @@ class FactExtractor:
             List of Fact objects
         """
         # Format prompt
-        prompt = EXTRACT_PROMPT.format(
-            question=question,
+        prompt = _prompts_for(question)[0].render(
             url=source.url,
-            content=source.content[:10000]  # Limit content length for API
+            content=self._excerpt(source, question)  # Limit content length for API
         )
 
         # Call Claude
-        response_text = self._call_claude(prompt)
+        response_text = await self.client.complete(
+            prompt,
+            validate=lambda text: self._parse_facts(text, source.url)
+        )
 
         # Parse facts
         facts = self._parse_facts(response_text, source.url)
 
         return facts
 
-    def _call_claude(self, prompt: str, max_retries: int = 3) -> str:
+    def _excerpt(self, source: Source, question: str) -> str:
         """
-        Call Claude API with retry logic.
+        Select the parts of a source worth sending to Claude.
 
         Args:
-            prompt: The prompt to send
-            max_retries: Maximum retry attempts
+            source: Source object
+            question: Research question (for relevance ranking)
 
         Returns:
-            Response text from Claude
-
-        Raises:
-            Exception: If all retries fail
+            Most relevant passages, within agent.extract_token_budget tokens
         """
-        for attempt in range(max_retries):
-            try:
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ]
-                )
-
-                return response.content[0].text
-
-            except anthropic.RateLimitError as e:
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt
-                    logger.warning(f"Rate limit hit, retrying in {wait_time}s...")
-                    time.sleep(wait_time)
-                else:
-                    logger.error("Rate limit exceeded, no more retries")
-                    raise
-
-            except anthropic.APIError as e:
-                logger.error(f"Claude API error: {e}")
-                raise
+        return select_relevant(source.content, question, max_tokens=self.token_budget)
 
     def _parse_facts(self, response_text: str, source_url: str) -> List[Fact]:
         """
@@ -151,52 +293,103 @@ class FactExtractor:
         Raises:
             ValueError: If response cannot be parsed
         """
-        try:
-            # Extract JSON from response
-            start_idx = response_text.find('{')
-            end_idx = response_text.rfind('}') + 1
+        data = self._load_json_object(response_text)
+
+        if 'facts' not in data:
+            raise ValueError("No 'facts' key in response")
+
+        facts_data = data['facts']
+        if not isinstance(facts_data, list):
+            raise ValueError("'facts' should be a list")
+
+        return self._build_facts(facts_data, source_url)
+
+    def _parse_batch_facts(
+        self, response_text: str, batch: List[Source]
+    ) -> List[List[Fact]]:
+        """
+        Parse per-source facts from a batched extraction response.
+
+        Args:
+            response_text: Raw response from Claude
+            batch: Sources in the order they were numbered in the prompt
 
-            if start_idx == -1 or end_idx == 0:
-                raise ValueError("No JSON object found in response")
+        Returns:
+            One list of Fact objects per source, aligned with batch
 
-            json_str = response_text[start_idx:end_idx]
-            data = json.loads(json_str)
+        Raises:
+            ValueError: If response cannot be parsed
+        """
+        data = self._load_json_object(response_text)
 
-            if 'facts' not in data:
-                raise ValueError("No 'facts' key in response")
+        per_source = data.get('sources')
+        if not isinstance(per_source, dict):
+            raise ValueError("'sources' should be an object keyed by source index")
 
-            facts_data = data['facts']
+        results = []
+        for idx, source in enumerate(batch, 1):
+            facts_data = per_source.get(str(idx), [])
             if not isinstance(facts_data, list):
-                raise ValueError("'facts' should be a list")
+                raise ValueError(f"Facts for source {idx} should be a list")
 
-            # Convert to Fact objects
-            facts = []
-            for fact_dict in facts_data:
-                try:
-                    fact = Fact(
-                        claim=fact_dict.get('claim', ''),
-                        caveat=fact_dict.get('caveat'),
-                        confidence=fact_dict.get('confidence', 'medium').lower(),
-                        source_url=source_url
-                    )
+            results.append(self._build_facts(facts_data, source.url))
 
-                    # Validate confidence
-                    if fact.confidence not in ['high', 'medium', 'low']:
-                        logger.warning(
-                            f"Invalid confidence '{fact.confidence}', defaulting to 'medium'"
-                        )
-                        fact.confidence = 'medium'
+        return results
 
-                    if fact.claim:  # Only add if we have a claim
-                        facts.append(fact)
+    def _load_json_object(self, response_text: str) -> Dict:
+        """
+        Extract and decode the JSON object in Claude's response.
 
-                except Exception as e:
-                    logger.warning(f"Failed to parse fact: {e}")
-                    continue
+        Args:
+            response_text: Raw response from Claude
 
-            return facts
+        Returns:
+            Decoded JSON object
+
+        Raises:
+            ValueError: If no valid JSON object is found
+        """
+        try:
+            return extract_first_json(response_text, 'object')
 
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             logger.error(f"Failed to parse JSON: {e}")
             logger.debug(f"Response text: {response_text}")
-            raise ValueError(f"Invalid JSON response: {e}")
+            raise
+
+    def _build_facts(self, facts_data: List[Dict], source_url: str) -> List[Fact]:
+        """
+        Convert raw fact dictionaries into validated Fact objects.
+
+        Args:
+            facts_data: List of fact dicts from Claude's response
+            source_url: URL of the source (for attribution)
+
+        Returns:
+            List of Fact objects
+        """
+        facts = []
+        for fact_dict in facts_data:
+            try:
+                fact = Fact(
+                    claim=fact_dict.get('claim', ''),
+                    caveat=fact_dict.get('caveat'),
+                    confidence=fact_dict.get('confidence', 'medium').lower(),
+                    source_url=source_url
+                )
+
+                # Validate confidence
+                if fact.confidence not in ['high', 'medium', 'low']:
+                    logger.warning(
+                        f"Invalid confidence '{fact.confidence}', defaulting to 'medium'"
+                    )
+                    fact.confidence = 'medium'
+
+                if fact.claim:  # Only add if we have a claim
+                    facts.append(fact)
+
+            except Exception as e:
+                logger.warning(f"Failed to parse fact: {e}")
+                continue
+
+        return facts
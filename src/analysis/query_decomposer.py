@@ -1,16 +1,17 @@
 """Query decomposer using Claude to break down complex questions."""
 
-import json
-import time
-from typing import Dict, List
-
-import anthropic
+from typing import Callable, Dict, List, Optional
 
 from src.agent.prompts import DECOMPOSE_PROMPT
+from src.utils.claude_client import AsyncClaudeClient
+from src.utils.json_utils import JsonArrayStream, extract_first_json
 from src.utils.logging_setup import get_logger
+from src.utils.prompt_template import SplitPrompt
 
 logger = get_logger(__name__)
 
+_DECOMPOSE_TEMPLATE = SplitPrompt(DECOMPOSE_PROMPT)
+
 
 class QueryDecomposer:
     """
@@ -19,28 +20,32 @@ class QueryDecomposer:
     AGENT DECISION POINT: How to break down questions for optimal coverage.
     """
 
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, client: Optional[AsyncClaudeClient] = None):
         """
         Initialize query decomposer.
 
         Args:
             config: Configuration dictionary with API settings
+            client: Shared Claude client (a private one is created if None)
         """
         self.config = config
-        self.client = anthropic.Anthropic(api_key=config['anthropic']['api_key'])
-        self.model = config['anthropic']['model']
-        self.max_tokens = config['anthropic'].get('max_tokens', 4000)
-        self.temperature = config['anthropic'].get('temperature', 0.3)
+        self.client = client or AsyncClaudeClient(config)
 
         self.min_queries = config['agent'].get('min_subqueries', 3)
         self.max_queries = config['agent'].get('max_subqueries', 5)
 
-    def decompose(self, question: str) -> List[str]:
+    async def decompose(
+        self,
+        question: str,
+        on_query: Optional[Callable[[str], None]] = None
+    ) -> List[str]:
         """
         Decompose a complex question into 3-5 searchable sub-queries.
 
         Args:
             question: The original research question
+            on_query: Optional callback invoked with each sub-query as soon as it
+                streams in, so callers can start work before the response completes
 
         Returns:
             List of sub-query strings
@@ -48,15 +53,17 @@ class QueryDecomposer:
         Note:
             Falls back to returning [original_question] if decomposition fails.
             Implements retry logic for rate limits.
+            on_query sees at most max_subqueries queries; the returned list is
+            authoritative and may differ (e.g. the single-question fallback).
         """
         logger.info(f"Decomposing question: '{question}'")
 
         # Format prompt
-        prompt = DECOMPOSE_PROMPT.format(question=question)
+        prompt = _DECOMPOSE_TEMPLATE.render(question=question)
 
         # Call Claude with retry logic
         try:
-            response_text = self._call_claude(prompt)
+            response_text = await self._stream_queries(prompt, on_query=on_query)
 
             # Parse JSON response
             sub_queries = self._parse_queries(response_text)
@@ -81,45 +88,49 @@ class QueryDecomposer:
             logger.info("Falling back to original question")
             return [question]
 
-    def _call_claude(self, prompt: str, max_retries: int = 3) -> str:
+    async def _stream_queries(
+        self,
+        prompt: str,
+        on_query: Optional[Callable[[str], None]] = None
+    ) -> str:
         """
-        Call Claude API with retry logic.
+        Stream the decomposition response, handing each sub-query to on_query.
 
         Args:
             prompt: The prompt to send
-            max_retries: Maximum retry attempts
+            on_query: Optional callback for each sub-query parsed from the stream
 
         Returns:
-            Response text from Claude
-
-        Raises:
-            Exception: If all retries fail
+            Full response text from Claude
         """
-        for attempt in range(max_retries):
-            try:
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ]
-                )
+        if on_query is None:
+            return await self.client.stream(
+                prompt, lambda text: None, validate=self._parse_queries
+            )
 
-                return response.content[0].text
+        parser = JsonArrayStream()
+        dispatched = 0
+        parse_failed = False
 
-            except anthropic.RateLimitError as e:
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt  # Exponential backoff
-                    logger.warning(f"Rate limit hit, retrying in {wait_time}s...")
-                    time.sleep(wait_time)
-                else:
-                    logger.error("Rate limit exceeded, no more retries")
-                    raise
+        def on_text(text: str) -> None:
+            nonlocal dispatched, parse_failed
+            if parse_failed:
+                return
 
-            except anthropic.APIError as e:
-                logger.error(f"Claude API error: {e}")
-                raise
+            # Hand each completed sub-query to the caller right away
+            try:
+                items = parser.feed(text)
+            except ValueError:
+                parse_failed = True  # Leave it to the full parse afterwards
+                return
+            for item in items:
+                if not isinstance(item, str) or not item.strip():
+                    continue
+                if dispatched < self.max_queries:
+                    on_query(item.strip())
+                    dispatched += 1
+
+        return await self.client.stream(prompt, on_text, validate=self._parse_queries)
 
     def _parse_queries(self, response_text: str) -> List[str]:
         """
@@ -135,26 +146,15 @@ class QueryDecomposer:
             ValueError: If response cannot be parsed
         """
         try:
-            # Try to find JSON array in response
-            # Sometimes Claude adds explanation text, so extract JSON
-            start_idx = response_text.find('[')
-            end_idx = response_text.rfind(']') + 1
+            # Sometimes Claude adds explanation text, so extract the first array
+            queries = extract_first_json(response_text, 'array')
 
-            if start_idx == -1 or end_idx == 0:
-                raise ValueError("No JSON array found in response")
-
-            json_str = response_text[start_idx:end_idx]
-            queries = json.loads(json_str)
-
-            if not isinstance(queries, list):
-                raise ValueError("Expected JSON array")
-
-            # Filter out empty queries
-            queries = [q.strip() for q in queries if q and q.strip()]
-
-            return queries
-
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             logger.error(f"Failed to parse JSON: {e}")
             logger.debug(f"Response text: {response_text}")
-            raise ValueError(f"Invalid JSON response: {e}")
+            raise
+
+        # Filter out empty queries
+        queries = [q.strip() for q in queries if q and q.strip()]
+
+        return queries
@@ -0,0 +1,100 @@
+"""Relevance-based selection of source passages for Claude prompts."""
+
+import math
+import re
+from collections import Counter
+from typing import List
+
+from src.utils.tokens import CHARS_PER_TOKEN, estimate_tokens
+
+# Long unbroken text is scored in windows of this many words
+PASSAGE_WORDS = 120
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_STOPWORDS = frozenset(
+    'a an and are as at be by can do does for from how in is it of on or '
+    'that the this to was what when where which who why will with'.split()
+)
+
+
+def _tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def _split_passages(content: str) -> List[str]:
+    """Split content into paragraphs, windowing any overly long ones."""
+    passages = []
+    for paragraph in re.split(r'\n+', content):
+        words = paragraph.split()
+        for start in range(0, len(words), PASSAGE_WORDS):
+            passages.append(' '.join(words[start:start + PASSAGE_WORDS]))
+    return passages
+
+
+def select_relevant(
+    content: str,
+    question: str,
+    max_tokens: int = 2000,
+    k1: float = 1.5,
+    b: float = 0.75
+) -> str:
+    """
+    Keep the passages of a source most relevant to the question.
+
+    Passages are ranked with BM25 against the question and the best ones are
+    kept until the token budget is reached, then returned in original order.
+
+    Args:
+        content: Full source text
+        question: Research question to score passages against
+        max_tokens: Approximate token budget for the returned text
+        k1: BM25 term-frequency saturation
+        b: BM25 length normalization
+
+    Returns:
+        Content trimmed to the budget (unchanged if it already fits)
+    """
+    if estimate_tokens(content) <= max_tokens:
+        return content
+
+    passages = _split_passages(content)
+    query_terms = set(_tokenize(question))
+    if len(passages) < 2 or not query_terms:
+        return content[:max_tokens * CHARS_PER_TOKEN]
+
+    # BM25 scoring of each passage against the question
+    passage_terms = [Counter(_tokenize(p)) for p in passages]
+    lengths = [sum(terms.values()) for terms in passage_terms]
+    avg_length = (sum(lengths) / len(lengths)) or 1.0
+    num_passages = len(passages)
+
+    idf = {}
+    for term in query_terms:
+        df = sum(1 for terms in passage_terms if term in terms)
+        idf[term] = math.log((num_passages - df + 0.5) / (df + 0.5) + 1)
+
+    scores = []
+    for terms, length in zip(passage_terms, lengths):
+        score = 0.0
+        norm = k1 * (1 - b + b * length / avg_length)
+        for term in query_terms:
+            tf = terms.get(term, 0)
+            if tf:
+                score += idf[term] * tf * (k1 + 1) / (tf + norm)
+        scores.append(score)
+
+    # Greedily keep top-scoring passages (earlier wins ties) within budget
+    ranked = sorted(range(num_passages), key=lambda i: (-scores[i], i))
+    selected = []
+    used = 0
+    for idx in ranked:
+        cost = estimate_tokens(passages[idx]) + 1
+        if used + cost > max_tokens:
+            continue
+        selected.append(idx)
+        used += cost
+
+    if not selected:
+        return passages[ranked[0]][:max_tokens * CHARS_PER_TOKEN]
+
+    return '\n'.join(passages[i] for i in sorted(selected))
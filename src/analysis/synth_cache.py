@@ -0,0 +1,95 @@
+"""Content-addressed cache for syntheses."""
+
+import hashlib
+from typing import Dict, List, Optional
+
+import orjson
+
+from src.search.search_types import Fact, Synthesis
+from src.utils.logging_setup import get_logger
+from src.utils.response_cache import open_cache
+
+logger = get_logger(__name__)
+
+
+class SynthCache:
+    """
+    Caches syntheses keyed on the question and the set of facts behind them.
+
+    Unlike the prompt-level response cache, the key ignores fact order and
+    question case/whitespace, so a re-asked question whose sources came back
+    in a different order still hits.
+    """
+
+    def __init__(self, config: Dict):
+        """
+        Initialize synthesis cache.
+
+        Args:
+            config: Configuration dictionary with API and output settings
+        """
+        self.enabled = config['anthropic'].get('cache_enabled', True)
+        self.ttl = config['anthropic'].get('synth_cache_ttl', 3600)  # seconds
+        self.model = config['anthropic']['model']
+        self.temperature = config['anthropic'].get('temperature', 0.3)
+        cache_dir = config['output'].get('cache_dir', 'data/cache')
+
+        self._cache = open_cache(cache_dir) if self.enabled else None
+
+    def make_key(self, question: str, facts: List[Fact]) -> str:
+        """
+        Build the cache key for a question and its facts.
+
+        Args:
+            question: The research question
+            facts: List of extracted facts
+
+        Returns:
+            Hex digest identifying the synthesis inputs
+        """
+        payload = orjson.dumps({
+            'q': ' '.join(question.lower().split()),
+            'facts': sorted((f.claim, f.source_url) for f in facts),
+            'model': self.model,
+            't': self.temperature,
+        }, option=orjson.OPT_SORT_KEYS)
+        return 'synth:' + hashlib.sha256(payload).hexdigest()
+
+    def get(self, question: str, facts: List[Fact]) -> Optional[Synthesis]:
+        """
+        Look up a cached synthesis.
+
+        Args:
+            question: The research question
+            facts: List of extracted facts
+
+        Returns:
+            Cached Synthesis, or None on a miss or when caching is disabled
+        """
+        if not self.enabled:
+            return None
+
+        data = self._cache.get(self.make_key(question, facts))
+        if data is None:
+            return None
+
+        logger.info("Using cached synthesis")
+        return Synthesis.from_dict(orjson.loads(data))
+
+    def set(self, question: str, facts: List[Fact], synthesis: Synthesis) -> None:
+        """
+        Store a synthesis.
+
+        Args:
+            question: The research question
+            facts: List of extracted facts
+            synthesis: Synthesis produced from them
+        """
+        if not self.enabled:
+            return
+
+        # Stored as orjson bytes (which serializes dataclasses natively)
+        # rather than a pickled dict
+        self._cache.set(
+            self.make_key(question, facts), orjson.dumps(synthesis), expire=self.ttl
+        )
@@ -1,17 +1,25 @@
 """Synthesizer using Claude to compare and synthesize findings from sources."""
 
-import json
-import time
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional, Tuple
 
-import anthropic
+import orjson
 
 from src.agent.prompts import SYNTHESIZE_PROMPT
-from src.search.search_types import Contradiction, Fact, Synthesis
+from src.analysis.synth_cache import SynthCache
+from src.search.search_types import Fact, Synthesis
+from src.utils.claude_client import AsyncClaudeClient
+from src.utils.json_utils import JsonStringFieldStream, extract_first_json
 from src.utils.logging_setup import get_logger
+from src.utils.prompt_template import SplitPrompt
+from src.utils.tokens import estimate_tokens
 
 logger = get_logger(__name__)
 
+# Facts dropped first when a prompt is over budget: low confidence, then short claims
+_CONFIDENCE_RANK = {'high': 0, 'medium': 1, 'low': 2}
+
+_SYNTHESIZE_TEMPLATE = SplitPrompt(SYNTHESIZE_PROMPT)
+
 
 class Synthesizer:
     """
@@ -20,26 +28,38 @@ class Synthesizer:
     AGENT DECISION POINT: How to reconcile conflicting information and identify gaps.
     """
 
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, client: Optional[AsyncClaudeClient] = None):
         """
         Initialize synthesizer.
 
         Args:
             config: Configuration dictionary with API settings
+            client: Shared Claude client (a private one is created if None)
         """
         self.config = config
-        self.client = anthropic.Anthropic(api_key=config['anthropic']['api_key'])
-        self.model = config['anthropic']['model']
+        self.client = client or AsyncClaudeClient(config)
+        self.cache = SynthCache(config)
         self.max_tokens = config['anthropic'].get('max_tokens', 4000)
-        self.temperature = config['anthropic'].get('temperature', 0.3)
+        self.context_window = config['anthropic'].get('context_window', 200000)
+
+        # Start Claude's reply with "{" so it can only be a JSON object
+        self.prefill = '{' if config['anthropic'].get('prefill_json', True) else ''
 
-    def synthesize(self, question: str, facts: List[Fact]) -> Synthesis:
+    async def synthesize(
+        self,
+        question: str,
+        facts: List[Fact],
+        on_answer: Optional[Callable[[str], None]] = None
+    ) -> Synthesis:
         """
         Synthesize findings from multiple facts.
 
         Args:
             question: The original research question
             facts: List of extracted facts
+            on_answer: Optional callback receiving the answer text as it streams
+                in; gets the whole answer at once if it isn't streamed (cache hit
+                or fallback)
 
         Returns:
             Synthesis object with agreements, contradictions, gaps, and answer
@@ -47,46 +67,130 @@ class Synthesizer:
         Note:
             Falls back to simple summarization if synthesis fails.
         """
-        logger.info(f"Synthesizing {len(facts)} facts")
+        logger.info("Synthesizing %d facts", len(facts))
+        streamed = False
+
+        def emit(text: str) -> None:
+            nonlocal streamed
+            if text:
+                streamed = True
+                on_answer(text)
 
         if not facts:
             logger.warning("No facts to synthesize")
-            return Synthesis(
-                agreements=[],
-                contradictions=[],
-                gaps=["No sources found with relevant information"],
-                answer="Unable to answer the question due to lack of sources."
-            )
+            synthesis = self._empty_synthesis()
+        else:
+            synthesis = self.cache.get(question, facts)
 
-        try:
-            # Prepare facts as JSON for prompt
-            facts_json = self._format_facts_for_prompt(facts)
+        if synthesis is None:
+            try:
+                prompt = await self._fit_to_budget(question, facts)
+                if on_answer is None:
+                    response_text = await self.client.complete(
+                        prompt, prefill=self.prefill, validate=self._parse_synthesis
+                    )
+                else:
+                    # Pull the answer field out of the JSON while it streams
+                    answer_stream = JsonStringFieldStream('answer')
+                    answer_stream.feed(self.prefill)
+                    response_text = await self.client.stream(
+                        prompt,
+                        lambda text: emit(answer_stream.feed(text)),
+                        prefill=self.prefill,
+                        validate=self._parse_synthesis
+                    )
+
+                # Parse synthesis
+                synthesis = self._parse_synthesis(response_text)
+                self.cache.set(question, facts, synthesis)
+
+                logger.info("Successfully synthesized findings")
+
+            except Exception as e:
+                logger.error("Synthesis failed: %s", e)
+                logger.info("Falling back to simple summarization")
+                synthesis = self._fallback_synthesis(question, facts)
+
+        if on_answer is not None and not streamed:
+            on_answer(synthesis.answer)
+        return synthesis
+
+    def _build_prompt(self, question: str, facts: List[Fact]) -> str:
+        """
+        Build the synthesis prompt for a question and its facts.
 
-            # Count unique sources
-            num_sources = len(set(f.source_url for f in facts))
+        Args:
+            question: The research question
+            facts: List of extracted facts
 
-            # Format prompt
-            prompt = SYNTHESIZE_PROMPT.format(
-                question=question,
-                num_sources=num_sources,
-                facts_json=facts_json
-            )
+        Returns:
+            Formatted prompt
+        """
+        # Prepare facts as JSON for prompt, counting unique sources on the way
+        facts_json, num_sources = self._format_facts_for_prompt(facts)
 
-            # Call Claude
-            response_text = self._call_claude(prompt)
+        return _SYNTHESIZE_TEMPLATE.render(
+            question=question,
+            num_sources=num_sources,
+            facts_json=facts_json
+        )
 
-            # Parse synthesis
-            synthesis = self._parse_synthesis(response_text)
+    async def _fit_to_budget(self, question: str, facts: List[Fact]) -> str:
+        """
+        Build the synthesis prompt, dropping facts until it fits the context window.
 
-            logger.info("Successfully synthesized findings")
-            return synthesis
+        The prompt plus max_tokens of output must fit in anthropic.context_window.
+        Prompts far below the limit by local estimate aren't counted at all.
+        Otherwise they're measured with the token counting endpoint, and when
+        over budget the lowest-confidence facts are dropped first; each
+        round drops enough facts (by local estimate) to cover the overage and
+        then recounts, so large overruns take a few token counts, not one per fact.
 
-        except Exception as e:
-            logger.error(f"Synthesis failed: {e}")
-            logger.info("Falling back to simple summarization")
-            return self._fallback_synthesis(question, facts)
+        Args:
+            question: The research question
+            facts: List of extracted facts
 
-    def _format_facts_for_prompt(self, facts: List[Fact]) -> str:
+        Returns:
+            Formatted prompt within budget
+        """
+        prompt = self._build_prompt(question, facts)
+        budget = self.context_window - self.max_tokens
+        if estimate_tokens(prompt) * 2 < budget:
+            return prompt  # Clearly fits; skip the counting round-trip
+
+        tokens = await self.client.count_tokens(prompt, self.prefill)
+        if tokens <= budget:
+            return prompt
+
+        ranked = sorted(
+            facts,
+            key=lambda f: (_CONFIDENCE_RANK.get(f.confidence, 1), -len(f.claim))
+        )
+        while tokens > budget and len(ranked) > 1:
+            overage = tokens - budget
+            while overage > 0 and len(ranked) > 1:
+                overage -= estimate_tokens(self._format_facts_for_prompt([ranked.pop()])[0])
+
+            kept = set(map(id, ranked))
+            prompt = self._build_prompt(question, [f for f in facts if id(f) in kept])
+            tokens = await self.client.count_tokens(prompt, self.prefill)
+
+        logger.warning(
+            "Synthesis prompt over budget; kept %d of %d facts (%d input tokens)",
+            len(ranked), len(facts), tokens
+        )
+        return prompt
+
+    def _empty_synthesis(self) -> Synthesis:
+        """Synthesis returned when there are no facts to work with."""
+        return Synthesis(
+            agreements=[],
+            contradictions=[],
+            gaps=["No sources found with relevant information"],
+            answer="Unable to answer the question due to lack of sources."
+        )
+
+    def _format_facts_for_prompt(self, facts: List[Fact]) -> Tuple[str, int]:
         """
         Format facts as JSON string for the prompt.
 
@@ -94,58 +198,22 @@ class Synthesizer:
             facts: List of Fact objects
 
         Returns:
-            JSON formatted string of facts
+            Tuple of (JSON formatted string of facts, number of unique sources)
         """
-        facts_data = []
-        for fact in facts:
-            facts_data.append({
+        seen_sources = set()
+
+        def encode(fact: Fact) -> str:
+            seen_sources.add(fact.source_url)
+            return orjson.dumps({
                 'claim': fact.claim,
                 'caveat': fact.caveat,
                 'confidence': fact.confidence,
                 'source': fact.source_url
-            })
+            }).decode('utf-8')
 
-        return json.dumps(facts_data, indent=2)
-
-    def _call_claude(self, prompt: str, max_retries: int = 3) -> str:
-        """
-        Call Claude API with retry logic.
-
-        Args:
-            prompt: The prompt to send
-            max_retries: Maximum retry attempts
-
-        Returns:
-            Response text from Claude
-
-        Raises:
-            Exception: If all retries fail
-        """
-        for attempt in range(max_retries):
-            try:
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ]
-                )
-
-                return response.content[0].text
-
-            except anthropic.RateLimitError as e:
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt
-                    logger.warning(f"Rate limit hit, retrying in {wait_time}s...")
-                    time.sleep(wait_time)
-                else:
-                    logger.error("Rate limit exceeded, no more retries")
-                    raise
-
-            except anthropic.APIError as e:
-                logger.error(f"Claude API error: {e}")
-                raise
+        # Encode fact by fact; orjson output is compact, since indentation only costs prompt tokens
+        facts_json = '[' + ','.join(encode(fact) for fact in facts) + ']'
+        return facts_json, len(seen_sources)
 
     def _parse_synthesis(self, response_text: str) -> Synthesis:
         """
@@ -161,43 +229,21 @@ class Synthesizer:
             ValueError: If response cannot be parsed
         """
         try:
-            # Extract JSON from response
-            start_idx = response_text.find('{')
-            end_idx = response_text.rfind('}') + 1
-
-            if start_idx == -1 or end_idx == 0:
-                raise ValueError("No JSON object found in response")
-
-            json_str = response_text[start_idx:end_idx]
-            data = json.loads(json_str)
-
-            # Parse contradictions
-            contradictions = []
-            for c in data.get('contradictions', []):
-                contradictions.append(Contradiction(
-                    issue=c.get('issue', ''),
-                    sources=c.get('sources', []),
-                    explanation=c.get('explanation', '')
-                ))
-
-            # Create Synthesis object
-            synthesis = Synthesis(
-                agreements=data.get('agreements', []),
-                contradictions=contradictions,
-                gaps=data.get('gaps', []),
-                answer=data.get('answer', '')
-            )
-
-            # Validate required fields
-            if not synthesis.answer:
-                raise ValueError("Missing 'answer' field in synthesis")
-
-            return synthesis
-
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON: {e}")
-            logger.debug(f"Response text: {response_text}")
-            raise ValueError(f"Invalid JSON response: {e}")
+            # Single forward pass to the end of the first JSON object
+            data = extract_first_json(response_text, 'object')
+
+        except ValueError as e:
+            logger.error("Failed to parse JSON: %s", e)
+            logger.debug("Response text: %s", response_text)
+            raise
+
+        synthesis = Synthesis.from_dict(data)
+
+        # Validate required fields
+        if not synthesis.answer:
+            raise ValueError("Missing 'answer' field in synthesis")
+
+        return synthesis
 
     def _fallback_synthesis(self, question: str, facts: List[Fact]) -> Synthesis:
         """
@@ -210,13 +256,18 @@ class Synthesizer:
         Returns:
             Basic Synthesis object
         """
-        # Group facts by confidence
-        high_conf = [f for f in facts if f.confidence == 'high']
+        # Count high confidence facts, keeping only the first three claims
+        num_high = 0
+        top_claims = []
+        for fact in facts:
+            if fact.confidence == 'high':
+                num_high += 1
+                if len(top_claims) < 3:
+                    top_claims.append(fact.claim)
 
         # Simple answer from high confidence facts
-        if high_conf:
-            answer = f"Based on {len(high_conf)} high-confidence sources: " + \
-                     " ".join([f.claim for f in high_conf[:3]])
+        if num_high:
+            answer = f"Based on {num_high} high-confidence sources: " + " ".join(top_claims)
         else:
             answer = "Multiple sources discuss this topic, but confidence levels vary. " + \
                      f"Key points include: {facts[0].claim if facts else 'No clear consensus.'}"
@@ -1,6 +1,11 @@
 """Streamlit web interface for the Research Assistant."""
 
+import json
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Dict
 
 import streamlit as st
 
@@ -16,6 +21,14 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+EXAMPLE_QUESTIONS = (
+    "What are the benefits of microservices architecture?",
+    "How does CRISPR gene editing work?",
+    "What are the latest developments in quantum computing?",
+    "What is the current state of fusion energy research?",
+    "How do transformer models work in natural language processing?",
+)
+
 
 def initialize_app():
     """Initialize application with config and logging."""
@@ -24,7 +37,13 @@ def initialize_app():
         logger = setup_logging(
             log_file=config['logging']['file'],
             level=config['logging']['level'],
-            console=config['logging'].get('console', True)
+            console=config['logging'].get('console', True),
+            log_format=config['logging'].get('format', 'text'),
+            file_level=config['logging'].get('file_level'),
+            max_bytes=config['logging'].get('max_bytes', 50 * 1024 * 1024),
+            backup_count=config['logging'].get('backup_count', 5),
+            watch_file=config['logging'].get('watch_file', False),
+            fast_records=config['logging'].get('fast_records', False)
         )
         return config, logger
     except Exception as e:
@@ -37,6 +56,57 @@ def initialize_app():
         st.stop()
 
 
+@st.cache_resource
+def get_research_executor(max_sessions: int) -> ThreadPoolExecutor:
+    """
+    Get the thread pool research runs execute on.
+
+    Running research off the script thread keeps the page responsive and
+    lets it show the orchestrator's real progress. Cached as a resource
+    because Streamlit re-executes this module on every rerun, so the pool is
+    shared by every session; runs beyond max_sessions wait in its queue.
+
+    Args:
+        max_sessions: Research runs executing at once (agent.max_sessions)
+
+    Returns:
+        Process-wide ThreadPoolExecutor
+    """
+    return ThreadPoolExecutor(max_workers=max_sessions, thread_name_prefix='research')
+
+
+def get_orchestrator(config: Dict) -> ResearchOrchestrator:
+    """
+    Get this session's orchestrator, rebuilding it only when settings change.
+
+    Reusing it across research clicks keeps its HTTP session, fetch cache and
+    thread pools warm. It is kept per session (not in st.cache_resource)
+    because a research run keeps per-run state on the orchestrator.
+
+    A replaced orchestrator is closed once its last research run (which an
+    interrupted rerun may have left going) has finished.
+
+    Args:
+        config: Current configuration (including sidebar overrides)
+
+    Returns:
+        ResearchOrchestrator for this config
+    """
+    config_key = json.dumps(config, sort_keys=True, default=str)
+    if st.session_state.get('orchestrator_key') != config_key:
+        previous = st.session_state.get('orchestrator')
+        if previous is not None:
+            running = st.session_state.pop('research_future', None)
+            if running is None:
+                previous.close()
+            else:
+                # Runs at once if the research already finished
+                running.add_done_callback(lambda _: previous.close())
+        st.session_state.orchestrator = ResearchOrchestrator(config)
+        st.session_state.orchestrator_key = config_key
+    return st.session_state.orchestrator
+
+
 def main():
     """Main Streamlit application."""
 
@@ -94,14 +164,7 @@ def main():
 
     # Example questions
     with st.expander("💡 Example Questions"):
-        examples = [
-            "What are the benefits of microservices architecture?",
-            "How does CRISPR gene editing work?",
-            "What are the latest developments in quantum computing?",
-            "What is the current state of fusion energy research?",
-            "How do transformer models work in natural language processing?"
-        ]
-        for ex in examples:
+        for ex in EXAMPLE_QUESTIONS:
             if st.button(ex, key=ex):
                 question = ex
                 st.rerun()
@@ -117,30 +180,39 @@ def main():
         status_text = st.empty()
 
         try:
-            # Initialize orchestrator
-            orchestrator = ResearchOrchestrator(config)
-
-            # Step 1: Decompose
-            status_text.text("🧠 Breaking down your question...")
-            progress_bar.progress(15)
-
-            # Step 2: Search
-            status_text.text("🔍 Searching web sources...")
-            progress_bar.progress(30)
-
-            # We can't track individual steps since research() is one call
-            # but we show progress to indicate activity
-            status_text.text("📥 Fetching content...")
-            progress_bar.progress(45)
-
-            status_text.text("📝 Extracting key facts...")
-            progress_bar.progress(65)
-
-            status_text.text("🔬 Synthesizing findings...")
-            progress_bar.progress(80)
-
-            # Run research (this does all the work)
-            report = orchestrator.research(question)
+            # Reuse this session's orchestrator
+            orchestrator = get_orchestrator(config)
+
+            # Run research (this does all the work) in the background, showing
+            # its progress and the answer as Claude writes it
+            answer_area = st.empty()
+            answer_chunks: queue.Queue = queue.Queue()
+            answer_parts = []
+            executor = get_research_executor(config['agent'].get('max_sessions', 4))
+            future = executor.submit(
+                orchestrator.research, question, on_answer=answer_chunks.put
+            )
+            st.session_state.research_future = future
+            while True:
+                finished = future.done()
+                if finished or future.running():
+                    status_text.text(f"🔬 {orchestrator.current_step}")
+                else:
+                    status_text.text("⏳ Queued behind other research runs...")
+                progress_bar.progress(orchestrator.progress_pct)
+                if not answer_chunks.empty():
+                    while not answer_chunks.empty():
+                        answer_parts.append(answer_chunks.get_nowait())
+                    answer_area.markdown(''.join(answer_parts))
+                if finished:
+                    break
+                time.sleep(0.2)
+            report = future.result()
+
+            # A failed stream or unparseable reply leaves a partial answer on
+            # screen while synthesis fell back to another one; show the real one
+            if ''.join(answer_parts) != report.synthesis.answer:
+                answer_area.markdown(report.synthesis.answer)
 
             progress_bar.progress(100)
             status_text.text("✅ Research complete!")
@@ -203,32 +275,20 @@ def main():
 
             st.markdown(f"*Extracted {len(report.facts)} facts from {len(report.sources)} sources*")
 
-            # Group by confidence
-            high_conf = [f for f in report.facts if f.confidence == 'high']
-            med_conf = [f for f in report.facts if f.confidence == 'medium']
-            low_conf = [f for f in report.facts if f.confidence == 'low']
-
-            if high_conf:
-                st.markdown("### ✓ High Confidence")
-                for fact in high_conf:
-                    st.markdown(f"**{fact.claim}**")
-                    if fact.caveat:
-                        st.caption(f"Caveat: {fact.caveat}")
-                    st.caption(f"[Source]({fact.source_url})")
-                    st.markdown("")
-
-            if med_conf:
-                st.markdown("### ○ Medium Confidence")
-                for fact in med_conf:
-                    st.markdown(f"**{fact.claim}**")
-                    if fact.caveat:
-                        st.caption(f"Caveat: {fact.caveat}")
-                    st.caption(f"[Source]({fact.source_url})")
-                    st.markdown("")
-
-            if low_conf:
-                st.markdown("### ? Low Confidence")
-                for fact in low_conf:
+            # Group by confidence in a single pass
+            buckets = {'high': [], 'medium': [], 'low': []}
+            for fact in report.facts:
+                buckets[fact.confidence].append(fact)
+
+            for heading, facts_list in (
+                ("### ✓ High Confidence", buckets['high']),
+                ("### ○ Medium Confidence", buckets['medium']),
+                ("### ? Low Confidence", buckets['low'])
+            ):
+                if not facts_list:
+                    continue
+                st.markdown(heading)
+                for fact in facts_list:
                     st.markdown(f"**{fact.claim}**")
                     if fact.caveat:
                         st.caption(f"Caveat: {fact.caveat}")
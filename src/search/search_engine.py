@@ -1,6 +1,17 @@
-"""Web search engine implementation using DuckDuckGo."""
+"""
+Web search engine implementation using DuckDuckGo.
 
+PERF: each search is one slow HTTPS round-trip with almost no local work,
+so the levers are running sub-queries concurrently (search_async) and
+keeping DDGS clients (and their connections) alive between searches.
+"""
+
+import asyncio
+import atexit
+import threading
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
 
 from duckduckgo_search import DDGS
@@ -10,6 +21,15 @@ from src.utils.logging_setup import get_logger
 
 logger = get_logger(__name__)
 
+# Engines with open DDGS clients, closed at interpreter exit
+_live_engines: 'weakref.WeakSet[SearchEngine]' = weakref.WeakSet()
+
+
+@atexit.register
+def _close_engines() -> None:
+    for engine in list(_live_engines):
+        engine.close()
+
 
 class SearchEngine:
     """
@@ -28,6 +48,42 @@ class SearchEngine:
         self.max_results = self.config.get('max_results_per_query', 5)
         self.timeout = self.config.get('timeout_seconds', 10)
 
+        # One DDGS client per worker thread, kept across searches so its
+        # connections stay open; DDGS isn't documented as thread-safe, and a
+        # shared client behind a lock would serialize concurrent searches
+        self._local = threading.local()
+        self._clients: List[DDGS] = []
+        self._clients_lock = threading.Lock()
+        _live_engines.add(self)
+
+        # Dedicated search threads that outlive each asyncio.run(), so their
+        # DDGS clients are reused run after run (the default executor, and
+        # any clients on its threads, is replaced with every new event loop)
+        self.search_workers = self.config.get('workers', 8)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.search_workers,
+            thread_name_prefix='search'
+        )
+
+    def _ddgs(self) -> DDGS:
+        """DDGS client for the calling thread (created on first use)."""
+        ddgs = getattr(self._local, 'ddgs', None)
+        if ddgs is None:
+            ddgs = DDGS(timeout=self.timeout)
+            self._local.ddgs = ddgs
+            with self._clients_lock:
+                self._clients.append(ddgs)
+        return ddgs
+
+    def close(self) -> None:
+        """Shut down the search threads and close every DDGS client this engine created."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        with self._clients_lock:
+            clients, self._clients = self._clients, []
+        for ddgs in clients:
+            ddgs.__exit__(None, None, None)
+        self._local = threading.local()
+
     def search(self, query: str, max_results: int = None) -> List[SearchResult]:
         """
         Search the web using DuckDuckGo.
@@ -55,19 +111,18 @@ class SearchEngine:
                 results = []
 
                 # Use DuckDuckGo search
-                with DDGS() as ddgs:
-                    search_results = ddgs.text(
-                        keywords=query,
-                        max_results=max_results,
-                        safesearch='moderate'
-                    )
-
-                    for result in search_results:
-                        results.append(SearchResult(
-                            url=result.get('href', result.get('link', '')),
-                            title=result.get('title', 'Untitled'),
-                            snippet=result.get('body', result.get('description', ''))
-                        ))
+                search_results = self._ddgs().text(
+                    keywords=query,
+                    max_results=max_results,
+                    safesearch='moderate'
+                )
+
+                for result in search_results:
+                    results.append(SearchResult(
+                        url=result.get('href', result.get('link', '')),
+                        title=result.get('title', 'Untitled'),
+                        snippet=result.get('body', result.get('description', ''))
+                    ))
 
                 logger.info(f"Found {len(results)} results for '{query}'")
                 return results
@@ -86,3 +141,19 @@ class SearchEngine:
                     return []  # Return empty list instead of crashing
 
         return []
+
+    async def search_async(self, query: str, max_results: int = None) -> List[SearchResult]:
+        """
+        Async variant of search() for concurrent fan-out.
+
+        DDGS is a blocking client, so the search runs on the engine's thread pool.
+
+        Args:
+            query: Search query string
+            max_results: Maximum results to return (uses config default if None)
+
+        Returns:
+            List of SearchResult objects
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, self.search, query, max_results)
@@ -2,12 +2,12 @@
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SearchResult:
-    """Result from a web search."""
+    """Result from a web search (immutable; many are created per run)."""
     url: str
     title: str
     snippet: str
@@ -38,6 +38,15 @@ class Contradiction:
     sources: List[str]
     explanation: str
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Contradiction':
+        """Build from a parsed JSON object, defaulting missing fields."""
+        return cls(
+            issue=data.get('issue', ''),
+            sources=data.get('sources', []),
+            explanation=data.get('explanation', '')
+        )
+
 
 @dataclass
 class Synthesis:
@@ -47,6 +56,16 @@ class Synthesis:
     gaps: List[str]
     answer: str
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Synthesis':
+        """Build from a parsed JSON object, defaulting missing fields."""
+        return cls(
+            agreements=data.get('agreements', []),
+            contradictions=[Contradiction.from_dict(c) for c in data.get('contradictions', [])],
+            gaps=data.get('gaps', []),
+            answer=data.get('answer', '')
+        )
+
 
 @dataclass
 class ResearchReport:
@@ -0,0 +1,313 @@
+"""Shared async Claude client with caching, rate limiting and retries."""
+
+import asyncio
+import threading
+import weakref
+from typing import Callable, Dict, List, Optional, Tuple
+
+import anthropic
+import httpx
+
+from src.utils.logging_setup import get_logger
+from src.utils.rate_limiter import ClaudeRateLimiter, retry_delay
+from src.utils.response_cache import ResponseCache
+from src.utils.tokens import estimate_tokens
+
+logger = get_logger(__name__)
+
+_shared_clients: Dict[Tuple[str, str], 'AsyncClaudeClient'] = {}
+_shared_lock = threading.Lock()
+
+
+def get_claude_client(config: Dict) -> 'AsyncClaudeClient':
+    """
+    Get the process-wide Claude client for this API key and model.
+
+    Every orchestrator (e.g. one per Streamlit rerun) gets the same client,
+    and with it the same response cache and rate limiter.
+
+    Args:
+        config: Configuration dictionary with API settings
+
+    Returns:
+        Shared AsyncClaudeClient
+    """
+    key = (config['anthropic']['api_key'], config['anthropic']['model'])
+    with _shared_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            client = AsyncClaudeClient(config)
+            _shared_clients[key] = client
+        return client
+
+
+def _is_retryable(error: anthropic.APIError) -> bool:
+    """Whether a failed request is worth retrying (rate limits, 5xx, network errors)."""
+    if isinstance(error, (anthropic.RateLimitError, anthropic.APIConnectionError)):
+        return True
+    return isinstance(error, anthropic.APIStatusError) and error.status_code >= 500
+
+
+def _messages(prompt: str, prefill: str = '') -> List[Dict[str, str]]:
+    """Message list for a single-turn prompt, optionally prefilling the reply."""
+    messages = [{"role": "user", "content": prompt}]
+    if prefill:
+        messages.append({"role": "assistant", "content": prefill})
+    return messages
+
+
+class AsyncClaudeClient:
+    """
+    The one place Claude requests are made from.
+
+    Owns the Anthropic client (and its connection pool), the response cache,
+    the RPM/TPM limiter, the concurrency cap and the retry loop, so every
+    component that talks to Claude gets the same behavior.
+
+    An AsyncAnthropic connection pool is bound to the event loop that first
+    used it, so one client is kept per event loop; a long-lived instance can
+    serve successive asyncio.run() calls without reusing dead connections.
+    Call aclose_loop_client() before such a loop ends, or its connections
+    are left open. The concurrency semaphore is kept per event loop for the
+    same reason.
+    """
+
+    def __init__(self, config: Dict):
+        """
+        Initialize Claude client.
+
+        Args:
+            config: Configuration dictionary with API settings
+        """
+        self._api_key = config['anthropic']['api_key']
+        self._max_connections = config['anthropic'].get('max_connections', 64)
+        self._max_keepalive = config['anthropic'].get('max_keepalive_connections', 32)
+        self._clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._concurrency = config['anthropic'].get('concurrency', 5)
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self.model = config['anthropic']['model']
+        self.max_tokens = config['anthropic'].get('max_tokens', 4000)
+        self.temperature = config['anthropic'].get('temperature', 0.3)
+        self.max_backoff = config['anthropic'].get('max_backoff', 30)
+        # Attempts per request; at least one, or complete()/stream() would return None
+        self.max_retries = max(1, config['anthropic'].get('max_retries', 8))
+
+        self.cache = ResponseCache(config)
+        self.rate_limiter = ClaudeRateLimiter(config)
+
+    @property
+    def client(self) -> anthropic.AsyncAnthropic:
+        """AsyncAnthropic client for the running event loop (created on first use)."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            # Keep idle connections open so later calls skip the TCP/TLS handshake
+            http_client = anthropic.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_keepalive
+                )
+            )
+            # Retries happen in complete()/stream(), which also respect the
+            # rate limiter; SDK retries on top would multiply attempts
+            client = anthropic.AsyncAnthropic(
+                api_key=self._api_key,
+                http_client=http_client,
+                max_retries=0
+            )
+            self._clients[loop] = client
+        return client
+
+    async def aclose_loop_client(self) -> None:
+        """Close the running event loop's AsyncAnthropic client and its connections."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+
+    @property
+    def in_flight(self) -> asyncio.Semaphore:
+        """Semaphore capping concurrent requests on the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def complete(
+        self,
+        prompt: str,
+        *,
+        max_tokens: Optional[int] = None,
+        prefill: str = '',
+        validate: Optional[Callable[[str], object]] = None
+    ) -> str:
+        """
+        Send a single-turn prompt and return the response text.
+
+        Repeated prompts are served from the response cache; a reply is only
+        cached if it wasn't cut off at max_tokens and validate accepts it.
+        At most anthropic.concurrency requests are in flight at once across
+        all callers on the running event loop (i.e. per research run).
+
+        Args:
+            prompt: The prompt to send
+            max_tokens: Response token limit (defaults to anthropic.max_tokens)
+            prefill: Start of Claude's reply (e.g. "{" to force a JSON object)
+            validate: Optional check run on the reply before it is cached (e.g.
+                the caller's parser); whatever it raises propagates uncached
+
+        Returns:
+            Response text from Claude, beginning with prefill
+
+        Raises:
+            anthropic.APIError: If the request fails with a non-retryable error
+                or every attempt fails
+        """
+        cache_key = prompt + prefill
+        max_tokens = max_tokens or self.max_tokens
+        cached = self.cache.get(self.model, cache_key, max_tokens, self.temperature)
+        if cached is not None:
+            return cached
+
+        for attempt in range(self.max_retries):
+            try:
+                await self.rate_limiter.acquire(prompt)
+                async with self.in_flight:
+                    response = await self._create(prompt, max_tokens, prefill)
+
+                response_text = prefill + response.content[0].text
+                self._remember(cache_key, max_tokens, response_text, response.stop_reason, validate)
+                return response_text
+
+            except anthropic.APIError as e:
+                if not _is_retryable(e):
+                    logger.error(f"Claude API error: {e}")
+                    raise
+                await self._backoff(attempt, e)
+
+    async def stream(
+        self,
+        prompt: str,
+        on_text: Callable[[str], None],
+        *,
+        max_tokens: Optional[int] = None,
+        prefill: str = '',
+        validate: Optional[Callable[[str], object]] = None
+    ) -> str:
+        """
+        Stream a single-turn prompt, passing each text chunk to on_text.
+
+        Repeated prompts are served from the response cache, in which case
+        on_text is not called; replies are cached under the same rules as
+        complete(). The stream counts against anthropic.concurrency until it
+        finishes.
+
+        Args:
+            prompt: The prompt to send
+            on_text: Callback for each text chunk as it arrives (prefill excluded)
+            max_tokens: Response token limit (defaults to anthropic.max_tokens)
+            prefill: Start of Claude's reply (e.g. "{" to force a JSON object)
+            validate: Optional check run on the full reply before it is cached
+
+        Returns:
+            Full response text from Claude, beginning with prefill
+
+        Raises:
+            anthropic.APIError: If the request fails with a non-retryable error,
+                every attempt fails, or the stream breaks after output was delivered
+        """
+        cache_key = prompt + prefill
+        max_tokens = max_tokens or self.max_tokens
+        cached = self.cache.get(self.model, cache_key, max_tokens, self.temperature)
+        if cached is not None:
+            return cached
+
+        for attempt in range(self.max_retries):
+            chunks = []
+            try:
+                await self.rate_limiter.acquire(prompt)
+                async with self.in_flight, self.client.messages.stream(
+                    model=self.model,
+                    max_tokens=max_tokens,
+                    temperature=self.temperature,
+                    messages=_messages(prompt, prefill)
+                ) as stream:
+                    async for text in stream.text_stream:
+                        chunks.append(text)
+                        on_text(text)
+                    stop_reason = (await stream.get_final_message()).stop_reason
+
+                response_text = prefill + ''.join(chunks)
+                self._remember(cache_key, max_tokens, response_text, stop_reason, validate)
+                return response_text
+
+            except anthropic.APIError as e:
+                if not _is_retryable(e):
+                    logger.error(f"Claude API error: {e}")
+                    raise
+                if chunks:
+                    # Already streamed partial output; retrying would replay it
+                    raise
+                await self._backoff(attempt, e)
+
+    async def count_tokens(self, prompt: str, prefill: str = '') -> int:
+        """
+        Count the input tokens of a single-turn prompt.
+
+        Uses the token counting endpoint (free, with its own rate limit) and
+        falls back to a local estimate if it fails.
+
+        Args:
+            prompt: The prompt to measure
+            prefill: Start of Claude's reply, if the prompt will be sent with one
+
+        Returns:
+            Number of input tokens
+        """
+        try:
+            result = await self.client.messages.count_tokens(
+                model=self.model,
+                messages=_messages(prompt, prefill)
+            )
+            return result.input_tokens
+        except anthropic.APIError as e:
+            logger.warning(f"Token counting failed ({e}), using an estimate")
+            return estimate_tokens(prompt + prefill)
+
+    def _remember(
+        self,
+        cache_key: str,
+        max_tokens: int,
+        response_text: str,
+        stop_reason: Optional[str],
+        validate: Optional[Callable[[str], object]]
+    ) -> None:
+        """Cache a reply unless it was truncated or fails the caller's validate()."""
+        if stop_reason == 'max_tokens':
+            logger.warning(f"Claude reply stopped at max_tokens ({max_tokens}); not caching it")
+            return
+        if validate is not None:
+            validate(response_text)  # Raises before a bad reply reaches the cache
+        self.cache.set(self.model, cache_key, max_tokens, self.temperature, response_text)
+
+    async def _create(self, prompt: str, max_tokens: Optional[int], prefill: str = ''):
+        """Send one messages.create request."""
+        return await self.client.messages.create(
+            model=self.model,
+            max_tokens=max_tokens or self.max_tokens,
+            temperature=self.temperature,
+            messages=_messages(prompt, prefill)
+        )
+
+    async def _backoff(self, attempt: int, error: anthropic.APIError) -> None:
+        """Sleep before the next attempt, or re-raise error if none are left."""
+        if attempt >= self.max_retries - 1:
+            logger.error(f"Claude request failed after {self.max_retries} attempts: {error}")
+            raise error
+
+        wait_time = retry_delay(attempt, error, self.max_backoff)
+        logger.warning(
+            f"Transient Claude error ({type(error).__name__}), retrying in {wait_time:.1f}s..."
+        )
+        await asyncio.sleep(wait_time)
@@ -1,7 +1,10 @@
 """Configuration loader with environment variable substitution."""
 
+import copy
 import os
 import re
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict
 
@@ -15,11 +18,23 @@ try:
 except ImportError:
     HAS_STREAMLIT = False
 
+# libyaml-backed loader when PyYAML was built with it (much faster to parse)
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# ${VAR_NAME} placeholders in config strings
+_ENV_RE = re.compile(r'\$\{([^}]+)\}')
+
 
 def load_config(config_path: str = None) -> Dict[str, Any]:
     """
     Load configuration from YAML file with environment variable substitution.
 
+    The file is read and validated once per path; later calls return a
+    copy of the cached result (callers may modify their copy freely).
+
     Args:
         config_path: Path to config file. Defaults to project root config.yaml
 
@@ -30,14 +45,37 @@ def load_config(config_path: str = None) -> Dict[str, Any]:
         FileNotFoundError: If config file doesn't exist
         ValueError: If required API key is missing
     """
-    # Load .env file if it exists
-    load_dotenv()
-
     # Default to config.yaml in project root
     if config_path is None:
         project_root = Path(__file__).parent.parent.parent
         config_path = project_root / "config.yaml"
 
+    return copy.deepcopy(_load_config_cached(str(Path(config_path).resolve())))
+
+
+def reload_config(config_path: str = None) -> Dict[str, Any]:
+    """
+    Load configuration again, discarding cached results.
+
+    Use after editing the config file, secrets or the environment it refers to.
+
+    Args:
+        config_path: Path to config file. Defaults to project root config.yaml
+
+    Returns:
+        Configuration dictionary
+    """
+    _load_config_cached.cache_clear()
+    _streamlit_secrets.cache_clear()
+    return load_config(config_path)
+
+
+@lru_cache(maxsize=4)
+def _load_config_cached(config_path: str) -> Dict[str, Any]:
+    """Read, substitute and validate the config at a resolved path."""
+    # Load .env file if it exists
+    load_dotenv()
+
     config_file = Path(config_path)
     if not config_file.exists():
         raise FileNotFoundError(
@@ -46,8 +84,8 @@ def load_config(config_path: str = None) -> Dict[str, Any]:
         )
 
     # Load YAML
-    with open(config_file) as f:
-        config = yaml.safe_load(f)
+    with open(config_file, 'rb') as f:
+        config = yaml.load(f, Loader=_YamlLoader)
 
     # Substitute environment variables
     config = _substitute_env_vars(config)
@@ -69,19 +107,36 @@ def _get_secret(key: str) -> str:
         Secret value or None
     """
     # Try Streamlit secrets first (for Streamlit Cloud deployment)
-    if HAS_STREAMLIT:
-        try:
-            return st.secrets.get(key)
-        except (KeyError, FileNotFoundError):
-            pass
+    value = _streamlit_secrets().get(key)
+    if value is not None:
+        return value
 
     # Fall back to environment variable
-    return os.getenv(key)
+    return os.environ.get(key)
+
+
+@lru_cache(maxsize=1)
+def _streamlit_secrets() -> Dict[str, Any]:
+    """
+    Snapshot of Streamlit secrets, read once.
+
+    Returns:
+        Secrets by key (empty if Streamlit or a secrets file isn't available)
+    """
+    if not HAS_STREAMLIT:
+        return {}
+    try:
+        return dict(st.secrets)
+    except (KeyError, FileNotFoundError):
+        return {}
 
 
 def _substitute_env_vars(obj: Any) -> Any:
     """
-    Recursively substitute ${VAR_NAME} patterns with environment variables.
+    Substitute ${VAR_NAME} patterns with environment variables.
+
+    Walks nested dicts/lists with an explicit stack and rewrites string
+    values in place, so no containers are copied.
 
     Args:
         obj: Configuration object (dict, list, str, etc.)
@@ -89,24 +144,39 @@ def _substitute_env_vars(obj: Any) -> Any:
     Returns:
         Object with environment variables substituted
     """
-    if isinstance(obj, dict):
-        return {key: _substitute_env_vars(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [_substitute_env_vars(item) for item in obj]
-    elif isinstance(obj, str):
-        # Match ${VAR_NAME} pattern
-        pattern = r'\$\{([^}]+)\}'
-        matches = re.findall(pattern, obj)
-
-        for var_name in matches:
-            # Try Streamlit secrets first, then environment
-            env_value = _get_secret(var_name)
-            if env_value is not None:
-                obj = obj.replace(f"${{{var_name}}}", env_value)
-
-        return obj
-    else:
-        return obj
+    if isinstance(obj, str):
+        return _substitute_str(obj)
+
+    stack = deque([obj])
+    while stack:
+        container = stack.pop()
+        if isinstance(container, dict):
+            items = container.items()
+        elif isinstance(container, list):
+            items = enumerate(container)
+        else:
+            continue
+
+        for key, value in items:
+            if isinstance(value, str):
+                container[key] = _substitute_str(value)
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+
+    return obj
+
+
+def _substitute_str(value: str) -> str:
+    """Replace each ${VAR_NAME} in one pass, leaving unset ones as-is."""
+    if '$' not in value:  # Most config strings are plain values
+        return value
+    return _ENV_RE.sub(_substitute_match, value)
+
+
+def _substitute_match(match: re.Match) -> str:
+    """Value for one ${VAR_NAME} match (Streamlit secrets first, then environment)."""
+    value = _get_secret(match.group(1))
+    return value if value is not None else match.group(0)
 
 
 def _validate_config(config: Dict[str, Any]) -> None:
@@ -0,0 +1,337 @@
+"""Helpers for pulling JSON out of Claude responses."""
+
+import json
+import re
+from typing import Any, List, Optional, Tuple
+
+import orjson
+
+
+class JsonArrayStream:
+    """
+    Incrementally parses the first top-level JSON array in a text stream.
+
+    Feed response chunks as they arrive; each call returns the array items
+    that were completed by that chunk. Text before the opening '[' (e.g. a
+    preamble Claude adds) is ignored, and so is anything after the closing ']'.
+    """
+
+    def __init__(self):
+        self._text = ''
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._item_start: Optional[int] = None
+        self.started = False
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Consume the next chunk of response text.
+
+        Args:
+            chunk: Newly received text
+
+        Returns:
+            Array items completed by this chunk (possibly empty)
+
+        Raises:
+            ValueError: If a completed item is not valid JSON
+        """
+        self._text += chunk
+        items = []
+
+        while self._pos < len(self._text) and not self.done:
+            idx = self._pos
+            ch = self._text[idx]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == '\\':
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:  # String item finished
+                        items.append(self._take(idx + 1))
+                continue
+
+            if self._depth == 0:
+                if ch == '[':
+                    self._depth = 1
+                    self.started = True
+                continue
+
+            # Between items of the top-level array
+            if self._depth == 1 and self._item_start is None:
+                if ch in ' \t\r\n,':
+                    continue
+                if ch == ']':
+                    self.done = True
+                    continue
+                self._item_start = idx
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in '[{':
+                self._depth += 1
+            elif ch in ']}':
+                self._depth -= 1
+                if self._depth == 1:  # Container item finished
+                    items.append(self._take(idx + 1))
+                elif self._depth == 0:  # Array closed right after a scalar item
+                    if self._item_start is not None:
+                        items.append(self._take(idx))
+                    self.done = True
+            elif ch == ',' and self._depth == 1:  # Scalar item finished
+                items.append(self._take(idx))
+
+        return items
+
+    def _take(self, end: int) -> Any:
+        """Decode the pending item ending at index end."""
+        raw = self._text[self._item_start:end].strip()
+        self._item_start = None
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON array item: {e}")
+
+
+class JsonStringFieldStream:
+    """
+    Incrementally extracts one top-level string field from a streamed JSON object.
+
+    Feed response chunks as they arrive; each call returns the newly
+    available (decoded) text of that field's value, so it can be shown
+    while Claude is still writing it. Nested objects and other fields are
+    skipped.
+    """
+
+    def __init__(self, field: str):
+        """
+        Initialize field stream.
+
+        Args:
+            field: Name of the top-level string field to extract
+        """
+        self.field = field
+        self._text = ''
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._expect_key = False
+        self._key_start: Optional[int] = None
+        self._last_key: Optional[str] = None
+        self._value_start: Optional[int] = None  # Set while inside the field's value
+        self.done = False
+
+    def feed(self, chunk: str) -> str:
+        """
+        Consume the next chunk of response text.
+
+        Args:
+            chunk: Newly received text
+
+        Returns:
+            Field text completed by this chunk (possibly empty)
+        """
+        self._text += chunk
+        text = self._text
+        out = []
+
+        while self._pos < len(text) and not self.done:
+            if self._value_start is not None:
+                out.append(self._scan_value())
+                if self._value_start is not None:
+                    break  # Waiting for more of the value
+                continue
+
+            ch = text[self._pos]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == '\\':
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._last_key = json.loads(text[self._key_start:self._pos])
+                        self._key_start = None
+                continue
+
+            if ch == '"':
+                if self._depth == 1 and self._expect_key:
+                    self._expect_key = False
+                    self._key_start = self._pos - 1
+                    self._in_string = True
+                elif self._depth == 1 and self._last_key == self.field:
+                    self._value_start = self._pos
+                else:
+                    self._in_string = True
+            elif ch in '{[':
+                self._depth += 1
+                if self._depth == 1:
+                    self._expect_key = ch == '{'
+            elif ch in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    self.done = True
+            elif ch == ',' and self._depth == 1:
+                self._expect_key = True
+                self._last_key = None
+
+        return ''.join(out)
+
+    def _scan_value(self) -> str:
+        """Decode as much of the field's string value as has arrived."""
+        text = self._text
+        pos = self._pos
+        closed = False
+
+        while pos < len(text):
+            ch = text[pos]
+            if ch == '"':
+                closed = True
+                break
+            if ch == '\\':
+                need = 2
+                if text[pos + 1:pos + 2] == 'u':
+                    need = 6
+                    # A high surrogate must be decoded together with its pair
+                    if 'd800' <= text[pos + 2:pos + 6].lower() <= 'dbff' \
+                            and text[pos + 6:pos + 8] in ('', '\\', '\\u'):
+                        need = 12
+                if pos + need > len(text):
+                    break  # Incomplete escape; wait for more text
+                pos += need
+                continue
+            pos += 1
+
+        decoded = json.loads('"' + text[self._pos:pos] + '"')
+        self._pos = pos
+        if closed:
+            self._pos += 1
+            self._value_start = None
+            self.done = True
+        return decoded
+
+
+_CODE_FENCE_RE = re.compile(r'```(?:json)?\s*(.+?)```', re.S)
+
+_JSON_KINDS = {
+    'object': ('{', '}', dict),
+    'array': ('[', ']', list),
+}
+
+# Characters that matter when scanning for the end of a JSON value
+_JSON_TOKEN_RES = {
+    'object': re.compile(r'[{}"\\]'),
+    'array': re.compile(r'[\[\]"\\]'),
+}
+
+
+def _locate_json(text: str, kind: str, start: int = 0) -> Tuple[int, int]:
+    """
+    Find the span of the first bracketed JSON object or array in text.
+
+    Scans forward from the first opening bracket, tracking bracket depth and
+    skipping brackets inside string values, and stops at the matching
+    closing bracket, so trailing commentary is never scanned.
+
+    Args:
+        text: Raw response text
+        kind: 'object' or 'array'
+        start: Index to start searching from
+
+    Returns:
+        (start, end) slice indices of the JSON value
+
+    Raises:
+        ValueError: If there is no opening bracket or it is never closed
+    """
+    opener, closer, _ = _JSON_KINDS[kind]
+
+    start_idx = text.find(opener, start)
+    if start_idx == -1:
+        raise ValueError(f"No JSON {kind} found in response")
+
+    depth = 0
+    in_string = False
+    skip_to = 0
+    for match in _JSON_TOKEN_RES[kind].finditer(text, start_idx):
+        idx = match.start()
+        if idx < skip_to:
+            continue  # Escaped character
+
+        ch = match.group()
+        if in_string:
+            if ch == '\\':
+                skip_to = idx + 2
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == opener:
+            depth += 1
+        elif ch == closer:
+            depth -= 1
+            if depth == 0:
+                return start_idx, idx + 1
+
+    raise ValueError(f"Unterminated JSON {kind} in response")
+
+
+def extract_first_json(text: str, kind: str = 'object') -> Any:
+    """
+    Decode the first JSON object or array in a Claude response.
+
+    The value is located with a single forward scan (see _locate_json), so
+    a preamble, trailing commentary and brackets inside string values are
+    all handled, and then parsed with orjson. A bracketed span that isn't
+    valid JSON (e.g. "[note]" in prose) is skipped in favor of the next
+    one. Falls back to the contents of a ```json code fence if that fails.
+
+    Args:
+        text: Raw response text
+        kind: 'object' or 'array'
+
+    Returns:
+        Decoded dict (object) or list (array)
+
+    Raises:
+        ValueError: If no valid JSON of the requested kind is found
+    """
+    opener, _, expected_type = _JSON_KINDS[kind]
+
+    try:
+        start_idx = 0
+        decode_error: Optional[ValueError] = None
+        while True:
+            if decode_error is not None and text.find(opener, start_idx) == -1:
+                raise decode_error  # No candidates left; report why the last one failed
+            start_idx, end_idx = _locate_json(text, kind, start_idx)
+            try:
+                value = orjson.loads(text[start_idx:end_idx].encode())
+                break
+            except orjson.JSONDecodeError as err:
+                decode_error = err
+                start_idx += 1  # Prose in brackets; try the next opener
+    except ValueError as e:  # Includes orjson.JSONDecodeError
+        match = _CODE_FENCE_RE.search(text)
+        if not match:
+            raise ValueError(f"Invalid JSON response: {e}")
+        try:
+            value = orjson.loads(match.group(1).encode())
+        except orjson.JSONDecodeError:
+            raise ValueError(f"Invalid JSON response: {e}")
+
+    if not isinstance(value, expected_type):
+        raise ValueError(f"Expected JSON {kind}")
+
+    return value
@@ -1,36 +1,360 @@
 """Logging configuration for the research assistant."""
 
+import atexit
+import copy
+import hashlib
 import logging
+import os
+import platform
+import subprocess
 import sys
+import threading
+import time
+from functools import lru_cache
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Optional
+from queue import Empty, Full, Queue
+from typing import Optional, Tuple, Union
+
+import orjson
+
+# Records held in memory before a batch is written to the log file
+# (ERROR and above are written at once), and the file's write buffer
+FILE_BUFFER_RECORDS = 1024
+FILE_BUFFER_BYTES = 64 * 1024
+
+# Longest a record waits in those buffers before the listener flushes them
+# (seconds), so a quiet or slow trickle of logging still reaches the file
+FLUSH_INTERVAL = 1.0
+
+# Records waiting for the listener thread; beyond this, new records are
+# dropped (and counted) rather than blocking or growing memory
+LOG_QUEUE_SIZE = 10000
+
+# Background thread writing queued records to the real handlers, and the
+# setup_logging() settings it was built with
+_listener: Optional[QueueListener] = None
+_settings: Optional[Tuple] = None
+_setup_lock = threading.Lock()
+
+_ROOT_LOGGER = logging.getLogger("research_assistant")
+
+# Process-wide stdlib switches for LogRecord fields neither format uses;
+# the values found before fast_records changed them, to restore later
+_RECORD_FIELD_FLAGS = (
+    '_srcfile', 'logThreads', 'logProcesses', 'logMultiprocessing', 'logAsyncioTasks'
+)
+_saved_record_flags: Optional[dict] = None
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that drops records when the queue is full.
+
+    Dropped records are counted; the next record that fits is preceded by
+    a WARNING saying how many were lost, so gaps stay visible in the log.
+
+    Unlike QueueHandler, it keeps a traceback in record.exc_text instead of
+    merging it into msg, so the JSON format can put it in its own field.
+    """
+
+    _exc_formatter = logging.Formatter()
+
+    def __init__(self, log_queue: Queue):
+        super().__init__(log_queue)
+        self._count_lock = threading.Lock()
+        self.dropped = 0
+        self._reported = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self._exc_formatter.formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None  # Tracebacks don't pickle
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.dropped != self._reported:
+            self._report_drops(record.name)
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            with self._count_lock:
+                self.dropped += 1
+
+    def _report_drops(self, name: str) -> None:
+        with self._count_lock:
+            lost = self.dropped - self._reported
+            self._reported = self.dropped
+        warning = logging.LogRecord(
+            name, logging.WARNING, '', 0,
+            "Log queue full; dropped %d records", (lost,), None
+        )
+        try:
+            self.queue.put_nowait(warning)
+        except Full:
+            with self._count_lock:
+                self._reported -= lost  # Still full; report on a later record
+
+
+class _QueueListener(QueueListener):
+    """
+    QueueListener that flushes its handlers periodically.
+
+    Handled records are flushed at most FLUSH_INTERVAL seconds later, whether
+    the queue is busy or has gone idle; with nothing unflushed it blocks
+    without waking up. Its stop() waits for room in a full queue instead of
+    raising.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._unflushed = False
+        self._flush_at = 0.0
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        while True:
+            timeout = None
+            if self._unflushed:
+                timeout = self._flush_at - time.monotonic()
+                if timeout <= 0:
+                    self._flush_handlers()
+                    continue
+            try:
+                return self.queue.get(block, timeout)
+            except Empty:
+                if not block:
+                    raise
+
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        if not self._unflushed:
+            self._unflushed = True
+            self._flush_at = time.monotonic() + FLUSH_INTERVAL
+
+    def _flush_handlers(self) -> None:
+        self._unflushed = False
+        for handler in self.handlers:
+            handler.flush()
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class _JsonFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line.
+
+    Uses the raw record.created timestamp (no strftime) and orjson, so it is
+    cheaper than the text format and the log file is trivially machine-readable.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': record.created,
+            'lvl': record.levelname,
+            'name': record.name,
+            'msg': record.getMessage(),
+        }
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return orjson.dumps(entry).decode('utf-8')
+
+
+class _UnflushedFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that leaves flushing to its caller.
+
+    Records are written without the per-record flush and size check; the
+    file is rolled over after a flush that takes it past maxBytes, so a
+    batch may overshoot the limit slightly.
+
+    With watch=True it also behaves like WatchedFileHandler, reopening the
+    file when something else (e.g. logrotate) has moved or deleted it.
+    """
+
+    def __init__(self, *args, watch: bool = False, **kwargs):
+        self.watch = watch
+        self._file_id = None  # (st_dev, st_ino) of the open file
+        super().__init__(*args, **kwargs)
+
+    def _open(self):
+        stream = open(
+            self.baseFilename, self.mode, buffering=FILE_BUFFER_BYTES,
+            encoding=self.encoding, errors=self.errors
+        )
+        if self.watch:
+            stat = os.fstat(stream.fileno())
+            self._file_id = (stat.st_dev, stat.st_ino)
+        return stream
+
+    def reopen_if_moved(self) -> None:
+        """Reopen the log file if the path no longer points at the open file."""
+        if not self.watch or self.stream is None:
+            return
+        try:
+            stat = os.stat(self.baseFilename)
+            file_id = (stat.st_dev, stat.st_ino)
+        except FileNotFoundError:
+            file_id = None
+        if file_id != self._file_id:
+            self.stream.flush()
+            self.stream.close()
+            self.stream = self._open()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        with self.lock:
+            super().flush()
+            if self.maxBytes > 0 and self.stream is not None:
+                if self.stream.tell() >= self.maxBytes:
+                    self.doRollover()
+
+
+class _BufferedFileHandler(MemoryHandler):
+    """
+    Writes records to a log file in batches.
+
+    Records are held in memory until FILE_BUFFER_RECORDS accumulate, an
+    ERROR arrives, the listener's periodic flush runs (FLUSH_INTERVAL) or
+    the handler closes, then written through one buffered stream and
+    flushed once per batch.
+    """
+
+    def __init__(self, log_file: str, max_bytes: int, backup_count: int, watch: bool = False):
+        # delay: the file isn't opened until the first write (the startup banner)
+        target = _UnflushedFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count,
+            encoding='utf-8', delay=True, watch=watch
+        )
+        super().__init__(
+            capacity=FILE_BUFFER_RECORDS,
+            flushLevel=logging.ERROR,
+            target=target,
+            flushOnClose=True
+        )
+
+    def setFormatter(self, fmt: logging.Formatter) -> None:
+        super().setFormatter(fmt)
+        self.target.setFormatter(fmt)
+
+    def flush(self) -> None:
+        with self.lock:
+            if self.buffer and self.target is not None:
+                self.target.reopen_if_moved()  # One stat per batch, not per record
+            super().flush()
+            if self.target is not None:
+                self.target.flush()
+
+    def close(self) -> None:
+        target = self.target
+        super().close()
+        if target is not None:
+            target.close()
 
 
 def setup_logging(
     log_file: str = "logs/research.log",
-    level: str = "INFO",
-    console: bool = True
+    level: Union[str, int] = "INFO",
+    console: bool = True,
+    log_format: str = "text",
+    file_level: Union[str, int, None] = None,
+    max_bytes: int = 50 * 1024 * 1024,
+    backup_count: int = 5,
+    watch_file: bool = False,
+    fast_records: bool = False
 ) -> logging.Logger:
     """
     Configure logging with file and console handlers.
 
+    Log calls only put records on a queue; a background listener thread
+    does the formatting and writing, so logging never blocks the caller
+    (e.g. the event loop) on disk or terminal I/O.
+
+    Calling it again with the same settings (e.g. from each Streamlit
+    session) returns the configured logger without reopening the file;
+    the handlers are only rebuilt when the settings change.
+
     Args:
         log_file: Path to log file
-        level: Logging level (DEBUG, INFO, WARNING, ERROR)
+        level: Logging level, as a name (DEBUG, INFO, WARNING, ERROR) or a
+            number such as logging.INFO (preferred for programmatic callers)
         console: Whether to log to console
+        log_format: Log file format: "text" or "json" (JSON lines); the
+            console always uses text
+        file_level: Level for the log file (defaults to level); e.g. DEBUG
+            keeps detail in the file while the console stays at INFO
+        max_bytes: Size at which the log file is rotated (0 never rotates)
+        backup_count: Rotated files kept (research.log.1, .2, ...)
+        watch_file: Reopen the log file when an external tool such as
+            logrotate moves it (POSIX only; pair with max_bytes=0)
+        fast_records: Stop the logging module collecting caller, thread and
+            process fields for every record (the optimizations listed in the
+            logging docs). This changes module-level flags for the whole
+            process, including other libraries' loggers, so only enable it
+            when the app owns logging; turning it off restores the old values
 
     Returns:
         Configured logger instance
+
+    Raises:
+        ValueError: If level or file_level is not a known level name
     """
+    global _settings
+
+    level_no = _level_number(level)
+    file_level_no = level_no if file_level is None else _level_number(file_level)
+    settings = (
+        str(Path(log_file).resolve()), level_no, console, log_format,
+        file_level_no, max_bytes, backup_count, watch_file and os.name == 'posix',
+        fast_records
+    )
+    with _setup_lock:
+        if _listener is not None and settings == _settings:
+            return _ROOT_LOGGER
+        logger = _configure(*settings, settings_hash=_settings_hash(settings))
+        _settings = settings
+        return logger
+
+
+def _configure(
+    log_file: str,
+    level_no: int,
+    console: bool,
+    log_format: str,
+    file_level_no: int,
+    max_bytes: int,
+    backup_count: int,
+    watch_file: bool,
+    fast_records: bool,
+    settings_hash: str
+) -> logging.Logger:
+    """Build the handlers and listener for setup_logging()."""
+    global _listener
+
     # Create logs directory if needed
     log_path = Path(log_file)
     log_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Get root logger
-    logger = logging.getLogger("research_assistant")
-    logger.setLevel(getattr(logging, level.upper()))
+    _set_fast_records(fast_records)
+
+    # Get root logger; records below both handler levels are dropped by
+    # isEnabledFor() before a LogRecord is even built
+    logger = _ROOT_LOGGER
+    logger.setLevel(min(level_no, file_level_no))
 
-    # Clear any existing handlers
+    # Clear any existing handlers (and the listener feeding them)
+    _stop_listener()
     logger.handlers.clear()
 
     # Format for log messages
@@ -39,22 +363,116 @@ def setup_logging(
         datefmt='%Y-%m-%d %H:%M:%S'
     )
 
-    # File handler
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.DEBUG)  # Log everything to file
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    # File handler (batched writes)
+    file_handler = _BufferedFileHandler(log_file, max_bytes, backup_count, watch_file)
+    file_handler.setLevel(file_level_no)
+    file_handler.setFormatter(_JsonFormatter() if log_format == 'json' else formatter)
+    handlers = [file_handler]
 
     # Console handler (if enabled)
     if console:
         console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(getattr(logging, level.upper()))
+        console_handler.setLevel(level_no)
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
+
+    # Startup banner, written straight to the file (past the queue and the
+    # batch buffer) and flushed so it's on disk even if the process dies
+    # soon after; written before the listener starts, so nothing races it
+    banner = logging.LogRecord(
+        logger.name, logging.INFO, '', 0,
+        "Logging started (pid=%d, python=%s, git=%s, settings=%s)",
+        (os.getpid(), platform.python_version(), _git_sha() or 'unknown', settings_hash),
+        None
+    )
+    file_handler.target.handle(banner)
+    file_handler.target.flush()
+    for handler in handlers[1:]:
+        if banner.levelno >= handler.level:
+            handler.handle(banner)
+
+    # The logger only enqueues; the listener thread emits to the handlers
+    log_queue: Queue = Queue(maxsize=LOG_QUEUE_SIZE)
+    logger.addHandler(_DroppingQueueHandler(log_queue))
+    _listener = _QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
 
     return logger
 
 
+def _settings_hash(settings: Tuple) -> str:
+    """Short digest of the effective setup_logging() settings, for the banner."""
+    return hashlib.blake2b(repr(settings).encode('utf-8'), digest_size=4).hexdigest()
+
+
+def _set_fast_records(enabled: bool) -> None:
+    """Turn off (or restore) collection of the unused LogRecord fields."""
+    global _saved_record_flags
+    if enabled:
+        if _saved_record_flags is None:
+            _saved_record_flags = {
+                flag: getattr(logging, flag, None) for flag in _RECORD_FIELD_FLAGS
+            }
+        logging._srcfile = None
+        logging.logThreads = False
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
+        logging.logAsyncioTasks = False
+    elif _saved_record_flags is not None:
+        for flag, value in _saved_record_flags.items():
+            setattr(logging, flag, value)
+        _saved_record_flags = None
+
+
+@lru_cache(maxsize=1)
+def _git_sha() -> Optional[str]:
+    """Commit the code is running from, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short=12', 'HEAD'],
+            cwd=Path(__file__).parent, capture_output=True, text=True,
+            timeout=2, check=True
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _level_number(level: Union[str, int]) -> int:
+    """Numeric value of a level name, including aliases like WARN (numbers pass through)."""
+    if isinstance(level, int):
+        return level
+    level_no = logging.getLevelName(level.upper())  # "Level X" for unknown names
+    if not isinstance(level_no, int):
+        raise ValueError(f"Unknown log level: {level}")
+    return level_no
+
+
+@atexit.register
+def _stop_listener() -> None:
+    """Flush queued records and close the handlers of the current listener."""
+    global _listener, _settings
+    if _listener is None:
+        return
+    _settings = None
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+def get_dropped_count() -> int:
+    """
+    Number of log records dropped because the log queue was full.
+
+    Returns:
+        Records dropped since logging was last configured
+    """
+    for handler in _ROOT_LOGGER.handlers:
+        if isinstance(handler, _DroppingQueueHandler):
+            return handler.dropped
+    return 0
+
+
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """
     Get a logger instance.
@@ -66,5 +484,11 @@ def get_logger(name: Optional[str] = None) -> logging.Logger:
         Logger instance
     """
     if name:
-        return logging.getLogger(f"research_assistant.{name}")
-    return logging.getLogger("research_assistant")
+        return _child_logger(name)
+    return _ROOT_LOGGER
+
+
+@lru_cache(maxsize=256)
+def _child_logger(name: str) -> logging.Logger:
+    """Logger under research_assistant for a module name (memoized)."""
+    return logging.getLogger(f"research_assistant.{name}")
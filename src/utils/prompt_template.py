@@ -0,0 +1,77 @@
+"""Prompt templates pre-split around their placeholders."""
+
+import string
+from typing import List, Optional, Tuple
+
+
+class SplitPrompt:
+    """
+    A str.format-style template parsed once into literal and placeholder parts.
+
+    Rendering is plain concatenation, so building many prompts from one
+    template doesn't re-parse it each time. bind() fills some placeholders
+    up front (e.g. the research question) and returns a smaller template.
+
+    Only bare {name} placeholders are supported (no format specs or
+    conversions), which is all the prompts in src.agent.prompts use.
+    """
+
+    def __init__(self, template: str):
+        """
+        Parse a template.
+
+        Args:
+            template: str.format-style template ({{ and }} are literal braces)
+        """
+        parts: List[Tuple[str, Optional[str]]] = []
+        for literal, field, _, _ in string.Formatter().parse(template):
+            parts.append((literal, field))
+        self._parts = parts
+
+    @classmethod
+    def _from_parts(cls, parts: List[Tuple[str, Optional[str]]]) -> 'SplitPrompt':
+        prompt = cls.__new__(cls)
+        prompt._parts = parts
+        return prompt
+
+    def bind(self, **values: str) -> 'SplitPrompt':
+        """
+        Fill some placeholders now and keep the rest for render().
+
+        Args:
+            **values: Placeholder values to substitute
+
+        Returns:
+            New SplitPrompt with the given placeholders merged into its literals
+        """
+        parts: List[Tuple[str, Optional[str]]] = []
+        pending = ''
+        for literal, field in self._parts:
+            pending += literal
+            if field is None:
+                continue
+            if field in values:
+                pending += str(values[field])
+            else:
+                parts.append((pending, field))
+                pending = ''
+        parts.append((pending, None))
+        return self._from_parts(parts)
+
+    def render(self, **values: str) -> str:
+        """
+        Fill all remaining placeholders.
+
+        Args:
+            **values: Placeholder values
+
+        Returns:
+            The finished prompt
+
+        Raises:
+            KeyError: If a placeholder has no value
+        """
+        return ''.join(
+            literal if field is None else literal + str(values[field])
+            for literal, field in self._parts
+        )
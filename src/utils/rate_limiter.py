@@ -0,0 +1,174 @@
+"""Client-side rate limiting for Claude API calls."""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+from src.utils.logging_setup import get_logger
+from src.utils.tokens import estimate_tokens
+
+logger = get_logger(__name__)
+
+
+def retry_delay(
+    attempt: int,
+    error: Optional[Exception] = None,
+    max_backoff: float = 30.0
+) -> float:
+    """
+    Compute how long to wait before retrying a failed Claude call.
+
+    Uses full-jitter exponential backoff, so concurrent calls that failed
+    together don't all retry at the same instant, and never waits less than
+    the server's retry-after header asks for.
+
+    Args:
+        attempt: Zero-based number of the attempt that failed
+        error: The API error, if any
+        max_backoff: Upper bound on the backoff in seconds
+
+    Returns:
+        Delay in seconds
+    """
+    retry_after = 0.0
+    response = getattr(error, 'response', None)
+    if response is not None:
+        try:
+            retry_after = float(response.headers.get('retry-after', 0))
+        except (TypeError, ValueError):
+            pass  # HTTP-date form; fall back to backoff alone
+
+    return max(retry_after, random.uniform(0, min(2 ** attempt, max_backoff)))
+
+
+class TokenBucket:
+    """
+    Async token bucket that refills continuously over a period.
+
+    Uses only the monotonic clock, a thread lock and asyncio.sleep, so one
+    bucket can be shared across event loops and threads (e.g. concurrent
+    Streamlit sessions, each in its own asyncio.run call).
+    """
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        """
+        Initialize token bucket.
+
+        Args:
+            capacity: Maximum units available per period
+            period: Refill period in seconds
+        """
+        self.capacity = capacity
+        self.rate = capacity / period
+        self._level = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()  # Never held across an await
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """
+        Wait until amount units are available, then take them.
+
+        Args:
+            amount: Units to take (capped at capacity so large requests still proceed)
+        """
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._level >= amount:
+                    self._level -= amount
+                    return
+                wait_time = (amount - self._level) / self.rate
+
+            logger.debug(f"Rate limiter waiting {wait_time:.2f}s")
+            await asyncio.sleep(wait_time)
+
+
+class ClaudeRateLimiter:
+    """
+    Keeps Claude calls under the account's requests- and tokens-per-minute limits.
+
+    Waiting here before sending is cheaper than getting a RateLimitError back
+    and retrying after a failed round-trip.
+    """
+
+    def __init__(self, config: Dict):
+        """
+        Initialize rate limiter.
+
+        Args:
+            config: Configuration dictionary with API settings
+        """
+        rpm = config['anthropic'].get('rpm', 50)
+        tpm = config['anthropic'].get('tpm', 30000)  # Input tokens per minute
+
+        self._requests = TokenBucket(rpm) if rpm else None
+        self._tokens = TokenBucket(tpm) if tpm else None
+
+    async def acquire(self, prompt: str) -> None:
+        """
+        Wait until a request carrying this prompt fits within the limits.
+
+        Args:
+            prompt: The prompt about to be sent
+        """
+        if self._requests is not None:
+            await self._requests.acquire(1)
+        if self._tokens is not None:
+            await self._tokens.acquire(estimate_tokens(prompt))
+
+
+class ResizableSemaphore:
+    """
+    Async semaphore whose permit count can change while it is in use.
+
+    Create it inside the running event loop; its condition variable binds to it.
+    """
+
+    def __init__(self, permits: int):
+        """
+        Initialize semaphore.
+
+        Args:
+            permits: Number of holders allowed at once
+        """
+        self._permits = permits
+        self._in_use = 0
+        self._cond = asyncio.Condition()
+
+    @property
+    def permits(self) -> int:
+        """Current permit count."""
+        return self._permits
+
+    async def resize(self, permits: int) -> None:
+        """
+        Change the permit count.
+
+        Shrinking never interrupts current holders; new holders just wait
+        until enough of them have left.
+
+        Args:
+            permits: New number of holders allowed at once
+        """
+        async with self._cond:
+            self._permits = permits
+            self._cond.notify_all()
+
+    async def __aenter__(self) -> 'ResizableSemaphore':
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_use < self._permits)
+            self._in_use += 1
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        async with self._cond:
+            self._in_use -= 1
+            self._cond.notify()
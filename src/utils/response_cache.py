@@ -0,0 +1,112 @@
+"""Persistent on-disk cache for Claude responses."""
+
+import hashlib
+from functools import lru_cache
+from typing import Dict, Optional
+
+import diskcache
+
+from src.utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+
+@lru_cache(maxsize=None)
+def open_cache(cache_dir: str) -> diskcache.Cache:
+    """
+    Open the cache for a directory, once per process.
+
+    Args:
+        cache_dir: Directory holding the cache database
+
+    Returns:
+        Shared diskcache.Cache instance
+    """
+    return diskcache.Cache(cache_dir)
+
+
+class ResponseCache:
+    """
+    Caches Claude responses on disk, keyed by model, prompt and sampling settings.
+
+    Identical prompts (ignoring whitespace differences) skip the API round-trip
+    on repeat runs. A reply cut short by a smaller max_tokens is never served
+    to a caller that asked for more.
+    """
+
+    def __init__(self, config: Dict):
+        """
+        Initialize response cache.
+
+        Args:
+            config: Configuration dictionary with API and output settings
+        """
+        self.enabled = config['anthropic'].get('cache_enabled', True)
+        self.ttl = config['anthropic'].get('cache_ttl', 7 * 86400)  # seconds
+        cache_dir = config['output'].get('cache_dir', 'data/cache')
+
+        self._cache = open_cache(cache_dir) if self.enabled else None
+
+    @staticmethod
+    def make_key(model: str, prompt: str, max_tokens: int, temperature: float) -> str:
+        """
+        Build the cache key for a prompt.
+
+        Args:
+            model: Claude model name
+            prompt: The prompt text
+            max_tokens: Response token limit of the request
+            temperature: Sampling temperature of the request
+
+        Returns:
+            Hex digest identifying the request
+        """
+        # Normalize whitespace so formatting noise in fetched content doesn't miss the cache
+        normalized = ' '.join(prompt.split())
+        key = '\x00'.join((model, str(max_tokens), repr(temperature), normalized))
+        return hashlib.blake2b(key.encode('utf-8')).hexdigest()
+
+    def get(self, model: str, prompt: str, max_tokens: int, temperature: float) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            model: Claude model name
+            prompt: The prompt text
+            max_tokens: Response token limit of the request
+            temperature: Sampling temperature of the request
+
+        Returns:
+            Cached response text, or None on a miss or when caching is disabled
+        """
+        if not self.enabled:
+            return None
+
+        response_text = self._cache.get(self.make_key(model, prompt, max_tokens, temperature))
+        if response_text is not None:
+            logger.info("Using cached Claude response")
+        return response_text
+
+    def set(
+        self,
+        model: str,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        response_text: str
+    ) -> None:
+        """
+        Store a response.
+
+        Args:
+            model: Claude model name
+            prompt: The prompt text
+            max_tokens: Response token limit of the request
+            temperature: Sampling temperature of the request
+            response_text: Response text from Claude
+        """
+        if not self.enabled:
+            return
+
+        key = self.make_key(model, prompt, max_tokens, temperature)
+        self._cache.set(key, response_text, expire=self.ttl)
@@ -0,0 +1,17 @@
+"""Token-count estimates for Claude prompts."""
+
+# Rough Claude tokenizer ratio for English prose
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the Claude token count of a text.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Approximate number of tokens
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
@@ -0,0 +1,39 @@
+"""URL helpers shared by search and fetching."""
+
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track referrals and never change page content
+_TRACKING_PARAMS = {'fbclid', 'gclid', 'mc_cid', 'mc_eid', 'ref_src'}
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name.startswith('utm_') or name in _TRACKING_PARAMS
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so trivially different links to one page compare equal.
+
+    Lowercases scheme and host, strips tracking query parameters (utm_* etc.)
+    and drops the fragment.
+
+    Args:
+        url: URL to normalize
+
+    Returns:
+        Normalized URL string
+    """
+    parts = urlsplit(url.strip())
+    query = urlencode([
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(key)
+    ])
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path or '/',
+        query,
+        ''
+    ))
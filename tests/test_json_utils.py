@@ -0,0 +1,127 @@
+"""Tests for the incremental and one-shot JSON helpers in src.utils.json_utils."""
+
+import json
+
+import pytest
+
+from src.utils.json_utils import JsonArrayStream, JsonStringFieldStream, extract_first_json
+
+
+def feed_in_chunks(parser, text, size):
+    """Feed text to a stream parser size characters at a time, collecting the output."""
+    out = []
+    for i in range(0, len(text), size):
+        result = parser.feed(text[i:i + size])
+        if isinstance(result, list):
+            out.extend(result)
+        else:
+            out.append(result)
+    return out
+
+
+# JsonArrayStream
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_array_stream_chunked(size):
+    text = 'Here you go:\n["alpha", "b\\"eta", {"k": [1, 2]}, 3, null] trailing ]'
+    parser = JsonArrayStream()
+    items = feed_in_chunks(parser, text, size)
+    assert items == ["alpha", 'b"eta', {"k": [1, 2]}, 3, None]
+    assert parser.started and parser.done
+
+
+def test_array_stream_items_arrive_as_completed():
+    parser = JsonArrayStream()
+    assert parser.feed('["first", "sec') == ["first"]
+    assert parser.feed('ond"') == ["second"]
+    assert parser.feed(']') == []
+    assert parser.done
+
+
+def test_array_stream_brackets_inside_strings():
+    parser = JsonArrayStream()
+    assert parser.feed('["a [b] c", "]"]') == ["a [b] c", "]"]
+
+
+def test_array_stream_empty_array():
+    parser = JsonArrayStream()
+    assert parser.feed('[ ]') == []
+    assert parser.done
+
+
+def test_array_stream_invalid_item():
+    parser = JsonArrayStream()
+    with pytest.raises(ValueError):
+        parser.feed('[nope, "x"]')
+
+
+# JsonStringFieldStream
+
+ANSWER = 'café \U0001F600 "quoted" \\ back\nslash — end'
+
+
+def answer_response():
+    return json.dumps({
+        "agreements": ["a", {"answer": "nested, not this one"}],
+        "answer": ANSWER,
+        "gaps": [],
+    })
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 13, 1000])
+def test_field_stream_chunked(size):
+    parser = JsonStringFieldStream("answer")
+    assert ''.join(feed_in_chunks(parser, answer_response(), size)) == ANSWER
+    assert parser.done
+
+
+def test_field_stream_split_escapes():
+    # Chunk boundaries inside \" and inside a \u escape
+    parser = JsonStringFieldStream("answer")
+    pieces = ['{"answer": "say \\', '"hi\\', '" caf\\u00', 'e9!"}']
+    assert ''.join(parser.feed(piece) for piece in pieces) == 'say "hi" café!'
+
+
+def test_field_stream_surrogate_pair_split():
+    # The high surrogate arrives before its low half
+    parser = JsonStringFieldStream("answer")
+    out = [parser.feed('{"answer": "x \\ud83d'), parser.feed('\\ude00 y"}')]
+    assert ''.join(out) == 'x \U0001F600 y'
+
+
+def test_field_stream_ascii_escaped_surrogates():
+    text = json.dumps({"answer": ANSWER}, ensure_ascii=True)
+    parser = JsonStringFieldStream("answer")
+    assert ''.join(feed_in_chunks(parser, text, 1)) == ANSWER
+
+
+def test_field_stream_missing_field():
+    parser = JsonStringFieldStream("answer")
+    assert parser.feed('{"other": "value", "n": 1}') == ''
+
+
+# extract_first_json
+
+def test_extract_skips_prose_in_brackets():
+    assert extract_first_json('Sure [note]: ["q1","q2"]', 'array') == ["q1", "q2"]
+
+
+def test_extract_ignores_preamble_and_trailing_text():
+    text = 'Here is the JSON:\n{"answer": "a } b", "n": [1]}\nHope that helps {'
+    assert extract_first_json(text, 'object') == {"answer": "a } b", "n": [1]}
+
+
+def test_extract_escaped_quotes_in_strings():
+    assert extract_first_json('{"a": "x \\" } y"}') == {"a": 'x " } y'}
+
+
+def test_extract_code_fence_fallback():
+    text = 'Bad {start\n```json\n{"ok": true}\n```'
+    assert extract_first_json(text, 'object') == {"ok": True}
+
+
+@pytest.mark.parametrize("text", ['no json here', '{"answer": "trunc', '[note] only'])
+def test_extract_errors(text):
+    kind = 'array' if text.startswith('[') else 'object'
+    with pytest.raises(ValueError):
+        extract_first_json(text, kind)